@@ -7,6 +7,7 @@ import signal
 import subprocess
 import sys
 import shutil
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
@@ -15,6 +16,11 @@ from typing import Any, Dict, Optional, Union
 
 import yaml
 
+from src.core.config_manager import PLAYER_SOCKET
+
+# Signaux de make-test (cf. src/core/signalgen.py ; recopiés ici pour ne pas charger NumPy au démarrage)
+SIGNALS = ("sine", "sweep", "multitone", "pink", "white", "gaps", "silence")
+
 # --- Paths
 REPO_ROOT = Path(__file__).resolve().parent
 DEFAULT_CONFIG = REPO_ROOT / "config" / "settings.yaml"
@@ -23,6 +29,7 @@ PID_FILE = STATE_DIR / "player.pid"
 META_FILE = STATE_DIR / "player.meta.yaml"
 OUT_LOG = STATE_DIR / "player.out.log"
 ERR_LOG = STATE_DIR / "player.err.log"
+SOCK_FILE = Path(PLAYER_SOCKET)
 
 
 # --- Utils
@@ -102,10 +109,18 @@ def pid_exists(pid: int) -> bool:
 
 
 # --- Audio Engine import
-def get_engine(device: str):
+def get_engine(device: str, outputs=None, sink=None):
     # Import here to keep commands like "devices" usable even if deps missing
     from src.core.audio_engine import AudioEngine
-    return AudioEngine(device=device)
+    return AudioEngine(device=device, outputs=outputs or None, sink=sink)
+
+
+def print_buffer_stats(engine) -> None:
+    s = engine.buffer_stats()
+    print(f"📊 Tampon {s['buffer_bytes'] // 1024} KB (pré-remplissage {s['prebuffer_bytes'] // 1024} KB) : "
+          f"{s['underruns']} sous-alimentation(s), {s['xruns']} xrun(s)")
+    for name, dropped in s["dropped"].items():
+        print(f"   ↳ {name} : {dropped} bloc(s) perdu(s)")
 
 
 # --- Commands
@@ -140,37 +155,54 @@ def cmd_set_device(args: argparse.Namespace) -> None:
     print(f"📄 Config: {cfg}")
 
 
-def spawn_background_play(args: argparse.Namespace, device: str, filename: str) -> None:
-    ensure_state_dir()
+def send_command(request: Dict[str, Any], timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    """Envoie une commande au lecteur persistant ; None s'il ne tourne pas."""
+    import json
+    import socket
+
+    if not SOCK_FILE.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(SOCK_FILE))
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data or b"{}")
+    except (OSError, ValueError):
+        return None
 
-    cfg = _p(args.config)
-    file_abs = _p(filename)
 
-    # Build command
-    cmd = [
-        sys.executable,
-        str(REPO_ROOT / "run.py"),
-        "--config",
-        str(cfg),
-        "play",
-        "--device",
-        device,
-        "--no-bg",
-    ]
-
-    # loop / repeat
-    if getattr(args, "loop", False):
-        cmd.append("--loop")
-    if getattr(args, "repeat", None) is not None and int(args.repeat) > 1:
-        cmd += ["--repeat", str(int(args.repeat))]
-
-    cmd.append(str(file_abs))
-
-    # Open logs
+def ensure_daemon(args: argparse.Namespace, device: str) -> bool:
+    """
+    Démarre le lecteur persistant s'il ne répond pas encore. Les sorties
+    (--sink / --also) sont fixées au démarrage : un lecteur déjà lancé avec
+    d'autres sorties est refusé plutôt que d'ignorer la demande.
+    """
+    sink, also = getattr(args, "sink", None), getattr(args, "also", None) or []
+    if send_command({"cmd": "status"}) is not None:
+        meta = load_yaml(META_FILE) if META_FILE.exists() else {}
+        if meta.get("device") not in (None, device):
+            print(f"⚠️ Lecteur déjà lancé sur {meta['device']} (stop --quit pour changer de device)")
+        if (sink or also) and (meta.get("sink"), meta.get("also") or []) != (sink, also):
+            print("❌ Lecteur déjà lancé avec d'autres sorties (stop --quit pour changer --sink / --also)")
+            return False
+        return True
+
+    ensure_state_dir()
+    cmd = [sys.executable, str(REPO_ROOT / "run.py"), "--config", str(_p(args.config)),
+           "daemon", "--device", device]
+    if sink:
+        cmd += ["--sink", sink]
+    for out in also:
+        cmd += ["--also", out]
     out_f = OUT_LOG.open("ab")
     err_f = ERR_LOG.open("ab")
-
-    # Spawn
     p = subprocess.Popen(
         cmd,
         stdout=out_f,
@@ -184,18 +216,44 @@ def spawn_background_play(args: argparse.Namespace, device: str, filename: str)
     meta = {
         "pid": p.pid,
         "device": device,
-        "file": str(file_abs),
+        "sink": sink,
+        "also": also,
         "started": now_str(),
         "cmd": cmd,
+        "socket": str(SOCK_FILE),
         "logs": {"out": str(OUT_LOG), "err": str(ERR_LOG)},
     }
     save_yaml(META_FILE, meta)
 
-    print("✅ Lecture lancée en arrière-plan")
-    print(f"   PID: {p.pid}")
-    print(f"   Device: {device}")
-    print(f"   Fichier: {file_abs}")
-    print(f"   Logs: {OUT_LOG} / {ERR_LOG}")
+    # Attente de la socket (imports + ouverture du moteur, une seule fois)
+    t0 = time.time()
+    while time.time() - t0 < 10.0:
+        if send_command({"cmd": "status"}, timeout=1.0) is not None:
+            print(f"✅ Lecteur persistant démarré (PID {p.pid})")
+            return True
+        if p.poll() is not None:
+            break
+        time.sleep(0.05)
+    print(f"❌ Le lecteur n'a pas démarré, voir {ERR_LOG}")
+    return False
+
+
+def spawn_background_play(args: argparse.Namespace, device: str, filename: str) -> None:
+    """Lecture en arrière-plan : confiée au lecteur persistant (démarré au besoin)."""
+    if not ensure_daemon(args, device):
+        return
+    file_abs = _p(filename)
+    repeats = max(int(args.repeat or 1), 1)
+    if args.volume is not None:
+        send_command({"cmd": "volume", "volume": args.volume})
+    r = send_command({"cmd": "play", "files": [str(file_abs)] * repeats, "loop": bool(args.loop)})
+    if r and r.get("ok"):
+        print("✅ Lecture lancée en arrière-plan")
+        print(f"   Device: {device}")
+        print(f"   Fichier: {file_abs}")
+        print(f"   Logs: {OUT_LOG} / {ERR_LOG}")
+    else:
+        print(f"❌ Lecture refusée : {(r or {}).get('error', 'pas de réponse')}")
 
 
 def cmd_play(args: argparse.Namespace) -> None:
@@ -219,21 +277,156 @@ def cmd_play(args: argparse.Namespace) -> None:
     if repeats < 1:
         repeats = 1
 
+    # Un seul moteur (et un seul PCM ouvert) pour toutes les répétitions
+    engine = get_engine(device, args.also, args.sink)
+    if args.volume is not None:
+        engine.set_volume(args.volume)
     try:
-        if args.loop:
-            while True:
-                engine = get_engine(device)
-                engine.play_any_file(str(file_abs))
+        engine.play_file(str(file_abs), repeat=repeats, loop=args.loop)
+    except KeyboardInterrupt:
+        print("\n⏹️ Lecture interrompue.")
+    finally:
+        engine.shutdown()
+        print_buffer_stats(engine)
+
+
+def expand_playlist(items: list) -> list:
+    """Fichiers audio et/ou playlists .m3u (chemins relatifs au .m3u)."""
+    files = []
+    for item in items:
+        path = _p(item)
+        if path.suffix.lower() in (".m3u", ".m3u8"):
+            for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    entry = Path(line)
+                    files.append(entry if entry.is_absolute() else (path.parent / entry).resolve())
         else:
-            for _ in range(repeats):
-                engine = get_engine(device)
-                engine.play_any_file(str(file_abs))
+            files.append(path)
+    return files
+
+
+def cmd_playlist(args: argparse.Namespace) -> None:
+    settings = load_yaml(_p(args.config))
+    device = args.device or settings.get("audio_device", "default")
+    files = expand_playlist(args.files)
+    print(f"🎧 Device utilisé : {device}")
+    print(f"📜 {len(files)} piste(s) en lecture enchaînée")
+
+    engine = get_engine(device, args.also, args.sink)
+    if args.volume is not None:
+        engine.set_volume(args.volume)
+    try:
+        engine.play_playlist([str(f) for f in files], crossfade_seconds=args.crossfade)
     except KeyboardInterrupt:
         print("\n⏹️ Lecture interrompue.")
+    finally:
+        engine.shutdown()
+        print_buffer_stats(engine)
+
+
+def _volume(value: str) -> int:
+    if not value.isdigit() or int(value) > 100:
+        raise argparse.ArgumentTypeError(f"volume entre 0 et 100 attendu : {value}")
+    return int(value)
+
+
+def _percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+class _RssSampler(threading.Thread):
+    """
+    Pic de RSS (processus + enfants ffmpeg) pendant une mesure, relevé toutes
+    les 20 ms : ru_maxrss est un maximum sur toute la vie du processus.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        import psutil
+        self._proc = psutil.Process()
+        self._done = threading.Event()
+        self.peak = 0
+
+    def _sample(self):
+        import psutil
+        rss = 0
+        for p in [self._proc] + self._proc.children(recursive=True):
+            try:
+                rss += p.memory_info().rss
+            except psutil.Error:
+                pass  # Enfant terminé entre-temps
+        self.peak = max(self.peak, rss)
+
+    def run(self):
+        while not self._done.wait(0.02):
+            self._sample()
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self._sample()
+        return self.peak
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    """Débit du moteur sans DAC : décodage + gain + sortie null, fichier par fichier."""
+    import resource
+
+    from src.core.decoding import probe_format
+    from src.core.sinks import NullSink, TimedSink
+
+    files = expand_playlist(args.files)
+    print(f"⏱️ Benchmark sur {len(files)} fichier(s) (sortie null)\n")
+    print(f"{'fichier':<32} {'format':<24} {'x temps réel':>12} {'bloc moy/p99 (µs)':>18} {'CPU %':>6} {'RSS pic (MB)':>12}")
+
+    for path in files:
+        try:
+            fmt = probe_format(str(path))
+        except Exception as e:
+            print(f"{path.name[:32]:<32} ❌ {e}")
+            continue
+        sink = TimedSink(NullSink())
+        engine = get_engine("null", outputs=[], sink=sink)
+        engine.use_pcm_cache = False  # On mesure le décodage, pas la relecture du cache
+        engine.set_volume(args.volume)
+
+        sampler = _RssSampler()
+        sampler.start()
+        before = [resource.getrusage(r) for r in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+        start = time.perf_counter()
+        engine.play_file(str(path))
+        wall = time.perf_counter() - start
+        after = [resource.getrusage(r) for r in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+        rss_mb = sampler.stop() / 2**20
+        engine.shutdown()
+
+        # CPU du processus + de ffmpeg (enfant), rapporté au temps écoulé
+        cpu = sum((a.ru_utime + a.ru_stime) - (b.ru_utime + b.ru_stime) for a, b in zip(after, before))
+        duration = sink.sink.frames / fmt.rate
+        t = sink.timings
+        mean_us = sum(t) / len(t) * 1e6 if t else 0.0
+        print(f"{path.name[:32]:<32} {str(fmt):<24} {duration / wall if wall else 0:>11.1f}x "
+              f"{mean_us:>8.1f} / {_percentile(t, 99) * 1e6:<8.1f} {100 * cpu / wall if wall else 0:>6.1f} {rss_mb:>12.1f}")
 
 
 def cmd_status(args: argparse.Namespace) -> None:
     print("📟 Toune-o-matic status")
+    r = send_command({"cmd": "status"})
+    if r is not None:
+        print(f"État: {r.get('state')}")
+        if r.get("file"):
+            print(f"Fichier: {r['file']} ({r.get('format')})")
+            print(f"Position: {r.get('position', 0):.1f} s{' (boucle)' if r.get('loop') else ''}")
+        if r.get("volume") is not None:
+            print(f"Volume: {r['volume']}")
+        print(f"File d'attente: {len(r.get('queue') or [])} piste(s)")
+        buf = r.get("buffer") or {}
+        print(f"Tampon: {buf.get('fill_bytes', 0) // 1024} / {buf.get('buffer_bytes', 0) // 1024} KB, "
+              f"{buf.get('underruns', 0)} sous-alimentation(s), {buf.get('xruns', 0)} xrun(s)")
+        return
+
     pid = read_pid()
     meta = load_yaml(META_FILE) if META_FILE.exists() else {}
 
@@ -257,7 +450,71 @@ def cmd_status(args: argparse.Namespace) -> None:
         clear_state()
 
 
+def cmd_daemon(args: argparse.Namespace) -> None:
+    """Lecteur persistant au premier plan (normalement lancé par play --bg)."""
+    import logging
+
+    from src.core.player_daemon import serve
+
+    logging.basicConfig(level=logging.INFO)
+    settings = load_yaml(_p(args.config))
+    device = args.device or settings.get("audio_device", "default")
+    ensure_state_dir()
+    print(f"🎧 Lecteur persistant sur {device} ({SOCK_FILE})")
+    try:
+        serve(str(SOCK_FILE), device=device, outputs=args.also, sink=args.sink)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        clear_state()
+
+
+def _client(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    r = send_command(request)
+    if r is None:
+        print("ℹ️ Aucun lecteur persistant (lancer une lecture avec play --bg)")
+    elif not r.get("ok"):
+        print(f"❌ {r.get('error', 'erreur')}")
+        return None
+    return r
+
+
+def cmd_enqueue(args: argparse.Namespace) -> None:
+    settings = load_yaml(_p(args.config))
+    if not ensure_daemon(args, args.device or settings.get("audio_device", "default")):
+        return
+    files = [str(f) for f in expand_playlist(args.files)]
+    r = _client({"cmd": "enqueue", "files": files})
+    if r:
+        print(f"➕ {len(files)} piste(s) ajoutée(s), {r['queued']} en attente")
+
+
+def cmd_pause(args: argparse.Namespace) -> None:
+    r = _client({"cmd": "pause"})
+    if r:
+        print("⏸️ Pause" if r["paused"] else "▶️ Reprise")
+
+
+def cmd_seek(args: argparse.Namespace) -> None:
+    r = _client({"cmd": "seek", "position": args.position})
+    if r:
+        print(f"⏩ Position : {r['position']:.1f} s")
+
+
+def cmd_volume(args: argparse.Namespace) -> None:
+    r = _client({"cmd": "volume", "volume": args.level})
+    if r:
+        print(f"🔊 Volume : {r['volume']}{' (gain unité)' if r['volume'] == 100 else ''}")
+
+
 def cmd_stop(args: argparse.Namespace) -> None:
+    r = send_command({"cmd": "quit" if args.quit else "stop"})
+    if r is not None:
+        print("✅ Lecteur arrêté." if args.quit else "⏹️ Lecture arrêtée (lecteur toujours prêt).")
+        if args.quit:
+            clear_state()
+        return
+
     pid = read_pid()
     if pid is None:
         print("ℹ️ Aucun lecteur en arrière-plan à arrêter (pas de PID).")
@@ -302,9 +559,7 @@ def cmd_stop(args: argparse.Namespace) -> None:
 
 
 def cmd_make_test(args: argparse.Namespace) -> None:
-    import math
-    import struct
-    import wave
+    from src.core.signalgen import generate, write_wav
 
     out_dir = Path(args.out_dir).expanduser()
     if not out_dir.is_absolute():
@@ -313,30 +568,47 @@ def cmd_make_test(args: argparse.Namespace) -> None:
 
     sample_rate = int(args.rate)
     duration = float(args.seconds)
-    freq = float(args.freq)
     channels = int(args.channels)
+    name = "test" if args.signal == "sine" else f"test_{args.signal}"
+    if args.signal == "pink":
+        try:
+            import scipy.signal  # noqa: F401
+        except ImportError:
+            print("❌ Bruit rose : scipy requis (pip install -r requirements.txt)")
+            return
+    if args.signal == "gaps" and int(sample_rate * float(args.gap)) < 1:
+        print(f"❌ --gap trop court : {args.gap} s (au moins une trame à {sample_rate} Hz)")
+        return
+    options = dict(kind=args.signal, rate=sample_rate, channels=channels, freq=float(args.freq),
+                   f_end=float(args.f_end), tones=args.tones, gap=float(args.gap))
+
+    # --split N : un signal continu découpé en N fichiers + playlist (test gapless)
+    parts = max(int(args.split), 1)
+    total = int(sample_rate * duration)
+    paths = []
+    state = {}  # État des filtres (bruit rose) transmis d'un fichier au suivant
+    start_t = time.perf_counter()
+    for i in range(parts):
+        begin, end = total * i // parts, total * (i + 1) // parts
+        path = out_dir / (f"{name}.wav" if parts == 1 else f"{name}_{i + 1:02d}.wav")
+        blocks = generate(seconds=(end - begin) / sample_rate, start=begin, total=total, state=state, **options)
+        write_wav(path, blocks, sample_rate, channels, bits=args.bits, level_db=args.level)
+        paths.append(path)
+    elapsed = time.perf_counter() - start_t
+
+    for path in paths:
+        print(f"✅ Fichier WAV généré : {path}")
+    print(f"   ↳ {args.signal}, {channels} ch, {sample_rate} Hz, {args.bits} bits, {duration:g} s "
+          f"({duration / elapsed if elapsed else 0:.0f}x temps réel)")
+    if parts > 1:
+        m3u = out_dir / f"{name}.m3u"
+        m3u.write_text("\n".join(p.name for p in paths) + "\n", encoding="utf-8")
+        print(f"✅ Playlist : {m3u}")
+        return
 
-    wav_path = out_dir / "test.wav"
-    mp3_path = out_dir / "test.mp3"
-
-    num_samples = int(sample_rate * duration)
-
-    with wave.open(str(wav_path), "w") as w:
-        w.setnchannels(channels)
-        w.setsampwidth(2)  # 16-bit
-        w.setframerate(sample_rate)
-
-        for i in range(num_samples):
-            v = int(32767 * 0.5 * math.sin(2 * math.pi * freq * i / sample_rate))
-            if channels == 1:
-                w.writeframesraw(struct.pack("<h", v))
-            else:
-                w.writeframesraw(struct.pack("<hh", v, v))
-
-    print(f"✅ Fichier WAV généré : {wav_path}")
-
+    mp3_path = out_dir / f"{name}.mp3"
     if shutil.which("ffmpeg"):
-        subprocess.run(["ffmpeg", "-y", "-i", str(wav_path), str(mp3_path)], check=False)
+        subprocess.run(["ffmpeg", "-y", "-i", str(paths[0]), str(mp3_path)], check=False)
         if mp3_path.exists():
             print(f"✅ Fichier MP3 généré : {mp3_path}")
     else:
@@ -408,6 +680,21 @@ def cmd_doctor(args: argparse.Namespace) -> None:
     except Exception as e:
         print(f"❌ ALSA open failed: {e}")
 
+    # Profil de la carte (sondé une fois, puis lu depuis le cache)
+    try:
+        from src.core.device_profiles import get_profile
+        profile = get_profile(dev, refresh=args.reprobe)
+        if profile is None:
+            print(f"\nℹ️ Pas de profil pour {dev} (device non matériel ou carte occupée)")
+        else:
+            print(f"\n📐 Profil {profile['card']} ({profile['device']})")
+            for width, rates in profile["formats"].items():
+                print(f"   ↳ {int(width) * 8} bits : {', '.join(str(r) for r in rates)} Hz")
+            print(f"   ↳ canaux : {profile['channels']}, période {profile['period_ms']} ms"
+                  f" (pilote : period={profile['period_size']}, buffer={profile['buffer_size']})")
+    except Exception as e:
+        print(f"❌ Profil ALSA : {e}")
+
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="run.py")
@@ -426,10 +713,18 @@ def build_parser() -> argparse.ArgumentParser:
     sp.set_defaults(func=cmd_set_device)
 
     sp = sub.add_parser("make-test", help="Générer un fichier test.wav (+ test.mp3 si ffmpeg)")
+    sp.add_argument("--signal", choices=SIGNALS, default="sine", help="Type de signal (défaut: sine)")
     sp.add_argument("--seconds", type=float, default=3.0, help="Durée du test (secondes)")
-    sp.add_argument("--freq", type=float, default=440.0, help="Fréquence (Hz)")
+    sp.add_argument("--freq", type=float, default=440.0, help="Fréquence (Hz) ; début du balayage pour sweep")
+    sp.add_argument("--f-end", type=float, default=20000.0, help="Fin du balayage (Hz, sweep)")
+    sp.add_argument("--tones", type=float, nargs="+", default=[100.0, 1000.0, 5000.0],
+                    help="Fréquences du multitone (Hz)")
+    sp.add_argument("--gap", type=float, default=0.5, help="Durée des alternances son/silence (s, gaps)")
     sp.add_argument("--rate", type=int, default=44100, help="Sample rate (Hz)")
-    sp.add_argument("--channels", type=int, choices=[1, 2], default=1, help="1=mono, 2=stéréo")
+    sp.add_argument("--bits", type=int, choices=[16, 24, 32], default=16, help="Résolution")
+    sp.add_argument("--channels", type=int, default=1, help="Nombre de canaux (1=mono, 2=stéréo...)")
+    sp.add_argument("--level", type=float, default=-6.0, help="Niveau crête (dBFS)")
+    sp.add_argument("--split", type=int, default=1, help="Découper en N fichiers continus + .m3u (test gapless)")
     sp.add_argument("--out-dir", default="audio/_local_test", help="Dossier de sortie")
     sp.set_defaults(func=cmd_make_test)
 
@@ -440,15 +735,63 @@ def build_parser() -> argparse.ArgumentParser:
     sp.add_argument("--no-bg", action="store_false", dest="bg", help=argparse.SUPPRESS)
     sp.add_argument("--loop", action="store_true", help="Boucle infinie (foreground ou bg)")
     sp.add_argument("--repeat", type=int, default=1, help="Nombre de répétitions (foreground ou bg)")
+    sp.add_argument("--volume", type=_volume, metavar="0-100",
+                    help="Volume logiciel (sinon config audio.engine_volume, 100 = gain unité)")
+    sp.add_argument("--sink", metavar="SORTIE", help="Remplace la sortie ALSA : null ou wav:fichier.wav")
+    sp.add_argument("--also", action="append", metavar="SORTIE",
+                    help="Sortie supplémentaire (alsa:hw:1,0, fifo:/tmp/snapfifo, file:x.raw), répétable")
     sp.set_defaults(func=cmd_play)
 
+    sp = sub.add_parser("playlist", help="Lecture enchaînée sans blanc (gapless)")
+    sp.add_argument("files", nargs="+", help="Fichiers audio ou playlists .m3u")
+    sp.add_argument("--device", help="Override device ALSA (sinon config)")
+    sp.add_argument("--crossfade", type=float, metavar="SECONDES",
+                    help="Fondu enchaîné entre les pistes (sinon config, 0 = gapless)")
+    sp.add_argument("--volume", type=_volume, metavar="0-100",
+                    help="Volume logiciel (sinon config audio.engine_volume, 100 = gain unité)")
+    sp.add_argument("--sink", metavar="SORTIE", help="Remplace la sortie ALSA : null ou wav:fichier.wav")
+    sp.add_argument("--also", action="append", metavar="SORTIE",
+                    help="Sortie supplémentaire (alsa:hw:1,0, fifo:/tmp/snapfifo, file:x.raw), répétable")
+    sp.set_defaults(func=cmd_playlist)
+
+    sp = sub.add_parser("bench", help="Mesurer le débit du moteur (sortie null, sans DAC)")
+    sp.add_argument("files", nargs="+", help="Fichiers audio ou playlists .m3u (un par format à mesurer)")
+    sp.add_argument("--volume", type=_volume, default=100, help="Volume logiciel (100 = gain unité, sans DSP)")
+    sp.set_defaults(func=cmd_bench)
+
     sp = sub.add_parser("status", help="État du lecteur en arrière-plan")
     sp.set_defaults(func=cmd_status)
 
     sp = sub.add_parser("stop", help="Arrêter le lecteur en arrière-plan")
+    sp.add_argument("--quit", action="store_true", help="Arrêter aussi le lecteur persistant")
     sp.set_defaults(func=cmd_stop)
 
+    sp = sub.add_parser("enqueue", help="Ajouter des pistes à la file du lecteur persistant")
+    sp.add_argument("files", nargs="+", help="Fichiers audio ou playlists .m3u")
+    sp.add_argument("--device", help="Override device ALSA (si le lecteur doit être démarré)")
+    sp.set_defaults(func=cmd_enqueue)
+
+    sp = sub.add_parser("pause", help="Pause / reprise du lecteur persistant")
+    sp.set_defaults(func=cmd_pause)
+
+    sp = sub.add_parser("seek", help="Aller à une position (secondes) dans la piste en cours")
+    sp.add_argument("position", type=float, help="Position en secondes")
+    sp.set_defaults(func=cmd_seek)
+
+    sp = sub.add_parser("volume", help="Volume logiciel du lecteur persistant (sans argument : l'afficher)")
+    sp.add_argument("level", type=_volume, nargs="?", metavar="0-100",
+                    help="100 = gain unité (bit-perfect)")
+    sp.set_defaults(func=cmd_volume)
+
+    sp = sub.add_parser("daemon", help="Lecteur persistant au premier plan (socket de contrôle)")
+    sp.add_argument("--device", help="Override device ALSA (sinon config)")
+    sp.add_argument("--sink", metavar="SORTIE", help="Remplace la sortie ALSA : null ou wav:fichier.wav")
+    sp.add_argument("--also", action="append", metavar="SORTIE",
+                    help="Sortie supplémentaire (alsa:hw:1,0, fifo:/tmp/snapfifo, file:x.raw), répétable")
+    sp.set_defaults(func=cmd_daemon)
+
     sp = sub.add_parser("doctor", help="Diagnostic venv/config/audio")
+    sp.add_argument("--reprobe", action="store_true", help="Sonder à nouveau la carte (ignore le cache)")
     sp.set_defaults(func=cmd_doctor)
 
     return p
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Mesure le débit HTTP de l'API (requêtes/s, latences p50/p95/p99).
+
+    python scripts/bench_http.py http://127.0.0.1:5001 -c 8 -n 2000
+    python scripts/bench_http.py http://raspberrypi.local:5001 --path /api/system/stats
+
+Uniquement la bibliothèque standard : se lance tel quel depuis un poste qui
+charge le Pi. Chaque client garde sa connexion ouverte (keep-alive) quand le
+serveur le permet.
+"""
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ["/api/status", "/api/audio/status", "/"]
+
+
+def _worker(host, port, paths, count, latencies, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    for i in range(count):
+        path = paths[i % len(paths)]
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 500:
+                errors.append(resp.status)
+            if resp.getheader("Connection", "").lower() == "close" or resp.version == 10:
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            errors.append(path)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def _percentile(values, pct):
+    return values[min(int(len(values) * pct / 100), len(values) - 1)] if values else 0.0
+
+
+def run(url, concurrency, total, paths):
+    parts = urlsplit(url)
+    latencies, errors = [], []
+    per_client = max(total // concurrency, 1)
+    threads = [
+        threading.Thread(target=_worker, args=(parts.hostname, parts.port or 80, paths, per_client, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": _percentile(latencies, 50) * 1000,
+        "p95": _percentile(latencies, 95) * 1000,
+        "p99": _percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_http.py")
+    p.add_argument("url", nargs="?", default="http://127.0.0.1:5001")
+    p.add_argument("-c", "--concurrency", type=int, default=8, help="Clients simultanés")
+    p.add_argument("-n", "--requests", type=int, default=2000, help="Nombre total de requêtes")
+    p.add_argument("--path", action="append", dest="paths", help="Chemin à interroger (répétable)")
+    p.add_argument("--warmup", type=int, default=50, help="Requêtes de chauffe non comptées")
+    args = p.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    if args.warmup:
+        run(args.url, 1, args.warmup, paths)
+    r = run(args.url, args.concurrency, args.requests, paths)
+    print(f"🌐 {args.url}  {args.concurrency} clients  {', '.join(paths)}")
+    print(f"   {r['requests']} requêtes en {r['seconds']:.2f} s : {r['rps']:.0f} req/s  ({r['errors']} erreurs)")
+    print(f"   latence p50 {r['p50']:.1f} ms  p95 {r['p95']:.1f} ms  p99 {r['p99']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
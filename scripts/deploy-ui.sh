@@ -1,14 +1,21 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Déploie tout le dossier UI (index + assets/) vers Nginx
-SRC_DIR="$HOME/toune-o-matic/ui/"
+# Construit puis déploie l'UI (index + assets/ empreintés et précompressés) vers Nginx
+REPO_DIR="$HOME/toune-o-matic"
+SRC_DIR="$REPO_DIR/build/ui/"
 DST_DIR="/var/www/toune-ui/"
 
+(cd "$REPO_DIR" && python3 -m src.core.ui_assets)
+
 sudo mkdir -p "$DST_DIR"
-sudo rsync -a --delete "$SRC_DIR" "$DST_DIR"
+sudo rsync -a --delete --exclude manifest.json "$SRC_DIR" "$DST_DIR"
 
+# Côté Nginx, pour servir les .gz/.br et ne jamais revalider les noms empreintés :
+#   gzip_static on;  brotli_static on;   (module brotli)
+#   location ~ "\.[0-9a-f]{10}\.\w+$" { add_header Cache-Control "public, max-age=31536000, immutable"; }
+#   location = /index.html { add_header Cache-Control "no-cache"; }
 sudo nginx -t
 sudo systemctl reload nginx
 
-echo "✅ UI déployée (index.html + assets/)"
+echo "✅ UI déployée (index.html + assets/ empreintés)"
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Rapport de démarrage du serveur Web : temps d'import par module et temps
+jusqu'à la première réponse, mesurés dans un interpréteur neuf.
+
+    python scripts/profile_startup.py                 # import + 1re requête (client de test)
+    python scripts/profile_startup.py --top 30
+    python scripts/profile_startup.py --url http://127.0.0.1:5001/api/status -- python server.py --prod
+
+Le second mode lance la vraie commande de service et mesure le temps jusqu'au
+premier 200 HTTP (ce que voit la tablette après un redémarrage du Pi).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Exécuté dans le processus mesuré : chaque étape est chronométrée séparément
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import server
+t1 = time.perf_counter()
+client = server.app.test_client()
+status = client.get("/api/status").status_code
+t2 = time.perf_counter()
+client.get("/api/status")
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first": t2 - t1, "second": t3 - t2, "status": status}))
+"""
+
+
+def _parse_importtime(stderr):
+    """Lignes 'import time: self | cumulé | module' -> [(cumulé µs, self µs, nom, profondeur)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            head, cumulative, raw = line.split("|", 2)
+            self_us, cumulative = int(head.split(":")[1]), int(cumulative)
+        except ValueError:
+            continue
+        depth = (len(raw) - len(raw.lstrip(" ")) - 1) // 2
+        rows.append((cumulative, self_us, raw.strip(), depth))
+    return rows
+
+
+def profile_imports(top):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE],
+                          cwd=REPO_ROOT, capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    timings = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("{"):
+            timings = json.loads(line)
+    if timings is None:
+        sys.stderr.write(proc.stderr[-2000:])
+        raise SystemExit("❌ Le processus mesuré a échoué")
+
+    rows = _parse_importtime(proc.stderr)
+    print("⏱️  Démarrage (interpréteur neuf, -X importtime : les imports sont un peu surestimés)")
+    print(f"   Processus complet          : {wall * 1000:7.1f} ms")
+    print(f"   import server (create_app) : {timings['import'] * 1000:7.1f} ms")
+    print(f"   1re requête /api/status    : {timings['first'] * 1000:7.1f} ms  (HTTP {timings['status']})")
+    print(f"   2e requête                 : {timings['second'] * 1000:7.1f} ms")
+
+    print("\n📦 Modules du projet (cumulé, dépendances incluses)")
+    for cumulative, self_us, name, _ in sorted((r for r in rows if r[2].startswith(("src", "server"))), reverse=True)[:top]:
+        print(f"   {cumulative / 1000:7.1f} ms  (propre {self_us / 1000:5.1f})  {name}")
+
+    packages = {}
+    for cumulative, _, name, depth in rows:
+        root = name.split(".")[0]
+        if root in ("src", "server"):
+            continue
+        if depth == 0 or root not in packages:
+            packages[root] = max(packages.get(root, 0), cumulative)
+    print("\n📚 Paquets les plus lourds (import de premier niveau)")
+    for root, cumulative in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"   {cumulative / 1000:7.1f} ms  {root}")
+
+
+def time_to_first_response(url, command, timeout):
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise SystemExit(f"❌ Le serveur s'est arrêté (code {proc.returncode})")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        elapsed = time.perf_counter() - start
+                        print(f"🚀 Première réponse 200 de {url} après {elapsed * 1000:.0f} ms")
+                        return elapsed
+            except OSError:
+                time.sleep(0.02)
+        raise SystemExit(f"❌ Pas de réponse après {timeout} s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    p = argparse.ArgumentParser(prog="profile_startup.py")
+    p.add_argument("--top", type=int, default=15, help="Nombre de lignes par tableau")
+    p.add_argument("--url", help="Mesurer le temps jusqu'au premier 200 sur cette URL")
+    p.add_argument("--timeout", type=float, default=60.0)
+    p.add_argument("command", nargs=argparse.REMAINDER, help="Commande du serveur (après --)")
+    args = p.parse_args()
+
+    if args.url:
+        command = [c for c in args.command if c != "--"] or [sys.executable, "server.py", "--prod"]
+        time_to_first_response(args.url, command, args.timeout)
+    else:
+        profile_imports(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,68 @@
+import argparse
+import os
+
 from src.app import create_app
 
+# --- MODE PRODUCTION ---
+# python server.py --prod (ou TOUNE_ENV=production) : serveur WSGI multi-threads,
+# sans reloader ni debugger, logs en INFO. Gunicorn (workers + threads) sur le Pi,
+# Waitress (threads seulement) à défaut, par exemple sur Mac.
+PRODUCTION = os.environ.get("TOUNE_ENV", "").lower() in ("prod", "production")
+DEFAULT_PORT = 5001  # Changement de port: 5000 -> 5001 pour éviter le conflit AirPlay
+DEFAULT_THREADS = 8
+DEFAULT_WORKERS = 1
+
 # Création de l'application Web
-app = create_app()
+app = create_app(production=PRODUCTION)
+
+
+def serve_production(app, host, port, threads=DEFAULT_THREADS, workers=DEFAULT_WORKERS):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is not None:
+        class _Gunicorn(BaseApplication):
+            def load_config(self):
+                self.cfg.set("bind", f"{host}:{port}")
+                self.cfg.set("workers", workers)
+                self.cfg.set("threads", threads)
+                self.cfg.set("worker_class", "gthread")
+                self.cfg.set("timeout", 0)  # Flux SSE (niveaux audio) : pas de coupure
+
+            def load(self):
+                return app
+
+        print(f"🚀 Gunicorn : {workers} worker(s) x {threads} thread(s) sur http://{host}:{port}")
+        _Gunicorn().run()
+        return
+
+    try:
+        from waitress import serve
+    except ImportError:
+        raise SystemExit("❌ Mode production : installez gunicorn (Pi) ou waitress (pip install gunicorn)")
+    if workers > 1:
+        print("⚠️  Waitress ne gère pas plusieurs workers : un seul processus")
+    print(f"🚀 Waitress : {threads} thread(s) sur http://{host}:{port}")
+    serve(app, host=host, port=port, threads=threads)
+
 
 if __name__ == "__main__":
-    print("🚀 Démarrage de Toune-o-Matic (Mode Développement Mac)...")
-    print("👉 Ouvrez votre navigateur sur : http://localhost:5001")
-    # Changement de port: 5000 -> 5001 pour éviter le conflit AirPlay
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    parser = argparse.ArgumentParser(prog="server.py")
+    parser.add_argument("--prod", action="store_true", default=PRODUCTION,
+                        help="Serveur WSGI de production (ou TOUNE_ENV=production)")
+    parser.add_argument("--host", default=os.environ.get("TOUNE_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("TOUNE_PORT", DEFAULT_PORT)))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("TOUNE_THREADS", DEFAULT_THREADS)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("TOUNE_WORKERS", DEFAULT_WORKERS)))
+    args = parser.parse_args()
+
+    if args.prod:
+        if not PRODUCTION:
+            app = create_app(production=True)
+        serve_production(app, args.host, args.port, args.threads, args.workers)
+    else:
+        print("🚀 Démarrage de Toune-o-Matic (Mode Développement Mac)...")
+        print(f"👉 Ouvrez votre navigateur sur : http://localhost:{args.port}")
+        app.run(host=args.host, port=args.port, debug=True)
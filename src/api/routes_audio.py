@@ -1,8 +1,45 @@
-from flask import Blueprint, jsonify, request
+import json
+import socket
+
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+
+from src.core.config_manager import PLAYER_SOCKET
+from src.core.metrics import registry
+from src.core.microcache import micro_cache
 
 audio_bp = Blueprint('audio', __name__)
 
+def _daemon_status(timeout=0.5):
+    """État du lecteur persistant, None s'il ne tourne pas."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(PLAYER_SOCKET)
+            sock.sendall(json.dumps({"cmd": "status"}).encode("utf-8") + b"\n")
+            return json.loads(sock.makefile("rb").readline())
+    except (OSError, ValueError):
+        return None
+
+@registry.register_collector
+def _player_metrics():
+    """Compteurs du lecteur (autre processus), lus à chaque scrape de /metrics."""
+    status = _daemon_status()
+    yield "toune_player_up", "gauge", "Lecteur persistant joignable", {}, int(status is not None)
+    if not status:
+        return
+    buffer = status.get("buffer") or {}
+    for key in ("underruns", "xruns", "frames"):
+        if key in buffer:
+            yield f"toune_player_{key}_total", "counter", f"Lecteur : {key}", {}, buffer[key]
+    for output, value in (buffer.get("dropped") or {}).items():
+        yield "toune_player_output_dropped_total", "counter", "Blocs perdus par sortie secondaire", {"output": output}, value
+    for event, value in (status.get("pcm_cache") or {}).items():
+        yield "toune_pcm_cache_events_total", "counter", "Cache PCM : hits / misses / stored / evicted", {"event": event}, value
+    for key, value in (status.get("levels") or {}).items():
+        yield "toune_level_frames_total", "counter", "VU-mètre : images calculées / sautées / perdues", {"event": key}, value
+
 @audio_bp.route('/status', methods=['GET'])
+@micro_cache(ttl=1.0)
 def audio_status():
     # Simulation d'une sortie audio pour le Mac
     return jsonify({
@@ -20,3 +57,29 @@ def toggle_output():
 @audio_bp.route('/configure', methods=['POST'])
 def configure_output():
     return jsonify({"status": "ok", "message": "Simulation: Config sauvegardée"})
+
+@audio_bp.route('/levels', methods=['GET'])
+def audio_levels():
+    """
+    VU-mètre / spectre en direct (Server-Sent Events), relayés depuis le
+    lecteur persistant. Aucun calcul ici : une ligne reçue = un événement.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(PLAYER_SOCKET)
+        sock.sendall(json.dumps({"cmd": "levels"}).encode("utf-8") + b"\n")
+    except OSError:
+        sock.close()
+        return jsonify({"status": "error", "message": "Lecteur non démarré"}), 503
+
+    def events():
+        try:
+            for line in sock.makefile("rb"):
+                yield b"data: " + line.strip() + b"\n\n"
+        finally:
+            sock.close()
+
+    resp = Response(stream_with_context(events()), mimetype='text/event-stream')
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'  # Pas de mise en tampon par un proxy
+    return resp
@@ -1,4 +1,13 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_file, abort, Response
+from src.core.db import get_db
+from src.core.covers import build_sprite, get_thumbnail, sprite_path
+from src.core.prefetcher import prefetcher
+from src.core.jobs import start_job, job_status
+from src.core.waveform import build_waveforms, read_cached
+from src.core.metrics import cache_requests
+from src.core.json_stream import stream_response
+from src.core.loudness import analyze_library
+import os
 
 content_bp = Blueprint('content', __name__)
 
@@ -29,6 +38,45 @@ def browse_albums():
         ]
     })
 
+def _albums_query(conn):
+    """Curseur sur une page d'albums (mêmes paramètres que la grille de l'UI)."""
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    return conn.execute(
+        "SELECT album, artist, MIN(path) AS path FROM tracks "
+        "GROUP BY album, artist ORDER BY album COLLATE NOCASE LIMIT ? OFFSET ?",
+        (limit, (page - 1) * limit)
+    )
+
+def _albums_page():
+    conn = get_db()
+    rows = _albums_query(conn).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+@content_bp.route('/browse/albums_global', methods=['GET'])
+def browse_albums_global():
+    conn = get_db()
+    return stream_response(conn, _albums_query(conn), "items", head={"ok": True})
+
+@content_bp.route('/browse/albums_global/sprite', methods=['GET'])
+def browse_albums_global_sprite():
+    """Carte JSON de la mosaïque de pochettes pour une page de la grille."""
+    items = _albums_page()
+    sprite = build_sprite(items)
+    sprite["url"] = f"/api/content/sprite/{sprite['key']}.jpg"
+    return jsonify({"ok": True, "items": items, "sprite": sprite})
+
+@content_bp.route('/sprite/<key>.jpg', methods=['GET'])
+def get_sprite(key):
+    path = sprite_path(os.path.basename(key))
+    if not os.path.exists(path):
+        abort(404)
+    # La clé dépend du contenu : le navigateur peut garder l'image indéfiniment
+    resp = send_file(path, mimetype='image/jpeg', max_age=31536000)
+    resp.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return resp
+
 @content_bp.route('/browse/tracks', methods=['GET'])
 def browse_tracks():
     return jsonify({
@@ -50,11 +98,40 @@ def playlists():
 
 @content_bp.route('/tasks/<action>', methods=['POST'])
 def tasks(action):
+    if action == 'artists':
+        # Parcours + récupération en tâche de fond, la requête répond tout de suite
+        if not prefetcher.prefetch_library():
+            return jsonify({"ok": False, "message": "Aucun fournisseur de métadonnées configuré"})
+        return jsonify({"ok": True, "message": "Préchargement des artistes lancé"})
+    if action == 'loudness':
+        started = start_job('loudness', analyze_library)
+        return jsonify({"ok": True, "message": "Analyse du volume lancée" if started else "Déjà en cours"})
+    if action == 'waveforms':
+        started = start_job('waveforms', build_waveforms)
+        return jsonify({"ok": True, "message": "Calcul des formes d'onde lancé" if started else "Déjà en cours"})
     return jsonify({"ok": True, "message": f"Tâche {action} simulée"})
 
+@content_bp.route('/tasks/status', methods=['GET'])
+def tasks_status():
+    return jsonify({"ok": True, "jobs": job_status()})
+
+@content_bp.route('/waveform', methods=['GET'])
+def get_waveform():
+    """Pics précalculés : paires (min, max) int8, une par colonne de la barre de lecture."""
+    peaks = read_cached(request.args.get('path', ''))
+    cache_requests.inc(cache="waveforms", result="hit" if peaks else "miss")
+    if not peaks:
+        return jsonify({"error": "No waveform"}), 404
+    resp = Response(peaks, mimetype='application/octet-stream')
+    resp.headers['Cache-Control'] = 'private, max-age=86400'
+    return resp
+
 @content_bp.route('/cover', methods=['GET'])
 def get_cover():
-    return jsonify({"error": "No cover"}), 404
+    thumb = get_thumbnail(request.args.get('path', ''), request.args.get('album', ''))
+    if thumb is None:
+        return jsonify({"error": "No cover"}), 404
+    return send_file(thumb, mimetype='image/jpeg', max_age=86400)
 
 @content_bp.route('/artist_image', methods=['GET'])
 def get_artist_image():
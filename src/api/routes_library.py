@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, request
 from src.core.db import get_db
 from src.core.scanner import scan_library
+from src.core.docs_index import search_documents, sync_documents, sync_if_stale
+from src.core.loudness import track_gain
+from src.core.json_stream import stream_response
 import threading
 
 bp = Blueprint("library", __name__, url_prefix="/api/library")
@@ -10,7 +13,8 @@ def trigger_scan():
     """Lance le scan en tâche de fond (thread) pour ne pas bloquer l'UI."""
     def run():
         scan_library()
-        
+        sync_documents()
+
     threading.Thread(target=run).start()
     return jsonify({"ok": True, "message": "Scan started in background"})
 
@@ -19,23 +23,38 @@ def search():
     """Recherche Full-Text (titre, artiste, album...)"""
     q = request.args.get("q", "").strip()
     if not q:
-        return jsonify({"ok": True, "results": []})
+        return jsonify({"ok": True, "results": [], "documents": []})
     
     # Recherche FTS (rapide)
     # On ajoute * pour faire une recherche préfixe (ex: "pink fl" -> "pink floyd")
     query_str = f"{q}*"
     
+    # Biographies / critiques (index FTS séparé, rafraîchi en tâche de fond)
+    sync_if_stale()
+    documents = search_documents(q)
+
+    # On limite à 100 résultats par défaut pour ne pas tuer le navigateur
+    limit = min(max(request.args.get("limit", 100, type=int), 1), 5000)
     conn = get_db()
-    # On limite à 100 résultats pour ne pas tuer le navigateur
-    rows = conn.execute(
-        "SELECT * FROM tracks_fts WHERE tracks_fts MATCH ? ORDER BY rank LIMIT 100", 
-        (query_str,)
-    ).fetchall()
-    
-    results = [dict(r) for r in rows]
-    conn.close()
-    
-    return jsonify({"ok": True, "count": len(results), "results": results})
+    cursor = conn.execute(
+        "SELECT * FROM tracks_fts WHERE tracks_fts MATCH ? ORDER BY rank LIMIT ?",
+        (query_str, limit)
+    )
+    # Résultats écrits au fil du curseur ; le total vient après la dernière ligne
+    return stream_response(conn, cursor, "results", head={"ok": True},
+                           tail=lambda n: {"count": n, "documents": documents})
+
+@bp.route("/export")
+def export():
+    """Toute la bibliothèque en JSON, en flux (mémoire constante quelle que soit la taille)."""
+    conn = get_db()
+    cursor = conn.execute(
+        "SELECT path, title, artist, album, genre, duration, year, loudness, peak, "
+        "album_loudness, album_peak FROM tracks ORDER BY path"
+    )
+    resp = stream_response(conn, cursor, "tracks", head={"ok": True}, tail=lambda n: {"count": n})
+    resp.headers["Content-Disposition"] = "attachment; filename=library.json"
+    return resp
 
 @bp.route("/stats")
 def stats():
@@ -43,3 +62,17 @@ def stats():
     count = conn.execute("SELECT Count(*) FROM tracks").fetchone()[0]
     conn.close()
     return jsonify({"ok": True, "total_tracks": count})
+
+@bp.route("/gain")
+def gain():
+    """Gain de normalisation précalculé pour une piste (lecteur / queue MPD)."""
+    path = request.args.get("path", "")
+    conn = get_db()
+    row = conn.execute(
+        "SELECT loudness, peak, album_loudness, album_peak FROM tracks WHERE path = ?", (path,)
+    ).fetchone()
+    gain_db = track_gain(path, conn)
+    conn.close()
+    if row is None:
+        return jsonify({"ok": False, "error": "Piste inconnue"}), 404
+    return jsonify({"ok": True, "path": path, "gain_db": gain_db, **dict(row)})
@@ -1,14 +1,24 @@
 # src/api/routes_metadata.py
 from flask import Blueprint, jsonify, request, send_from_directory, current_app
-from src.core.metadata import MetadataManager
+from src.core import metadata
+from src.core.prefetcher import prefetcher
 import os
 
 # On crée un "Blueprint" (un groupe de routes)
 metadata_bp = Blueprint('metadata', __name__)
 
-# On initialise le gestionnaire (Il utilisera le chemin défini dans metadata.py)
-# Sur le Pi, ce sera /mnt/music/Documents
-meta_manager = MetadataManager()
+_meta_manager = None
+
+def meta_manager():
+    """
+    Gestionnaire créé au premier appel, pas à l'import : il crée ses dossiers
+    sur le partage réseau (/mnt/music/Documents sur le Pi), ce qui peut
+    bloquer plusieurs secondes au démarrage si le NAS n'est pas encore monté.
+    """
+    global _meta_manager
+    if _meta_manager is None:
+        _meta_manager = metadata.MetadataManager()
+    return _meta_manager
 
 @metadata_bp.route('/info/<artist_name>', methods=['GET'])
 def get_artist_info(artist_name):
@@ -17,10 +27,10 @@ def get_artist_info(artist_name):
     Exemple: GET /api/metadata/info/Pink%20Floyd
     """
     # 1. On récupère le texte
-    bio = meta_manager.get_artist_bio(artist_name)
+    bio = meta_manager().get_artist_bio(artist_name)
     
     # 2. On s'assure que l'image existe (le script la télécharge si besoin)
-    image_path = meta_manager.get_artist_image(artist_name)
+    image_path = meta_manager().get_artist_image(artist_name)
     
     # 3. On construit la réponse JSON pour l'interface
     response = {
@@ -36,5 +46,10 @@ def serve_artist_image(artist_name):
     API: Sert l'image .jpg directement au navigateur
     """
     # Le dossier où sont stockées les images
-    img_folder = meta_manager.FOLDERS["artist_imgs"]
-    return send_from_directory(img_folder, f"{artist_name}.jpg")
\ No newline at end of file
+    img_folder = metadata.FOLDERS["artist_imgs"]
+    return send_from_directory(img_folder, f"{artist_name}.jpg")
+
+@metadata_bp.route('/prefetch/status', methods=['GET'])
+def prefetch_status():
+    """API: Compteurs du préchargement en tâche de fond"""
+    return jsonify({"ok": True, "prefetch": prefetcher.status()})
@@ -1,11 +1,13 @@
 # src/api/routes_system.py
 from flask import Blueprint, jsonify, request
 from src.core.sys_monitor import get_system_stats
+from src.core.microcache import micro_cache
 import os
 
 system_bp = Blueprint('system', __name__)
 
 @system_bp.route('/stats', methods=['GET'])
+@micro_cache(ttl=2.0)
 def stats():
     """Renvoie les métriques CPU/RAM/Disk/Temp"""
     data = get_system_stats()
@@ -1,6 +1,5 @@
-import os
 import logging
-from flask import Flask, jsonify
+from flask import Flask, abort, jsonify, request
 from flask_cors import CORS
 
 # Imports des Blueprints
@@ -12,12 +11,27 @@ from src.api.routes_system import system_bp
 from src.api.routes_metadata import metadata_bp
 from src.api.routes_bluetooth import bluetooth_bp
 from src.api.routes_settings import settings_bp  # <--- NOUVEAU
+from src.api.routes_library import bp as library_bp
+from src.core.json_stream import json_provider
+from src.core.metrics import instrument_app
+from src.core.microcache import micro_cache
+from src.core.ui_assets import AssetIndex
 
-def create_app():
-    app = Flask(__name__, static_folder='../ui', static_url_path='')
+def create_app(production=False):
+    # Pas de route statique Flask : l'interface est servie par AssetIndex (cf. ui_assets)
+    app = Flask(__name__, static_folder=None)
     CORS(app)
-    logging.basicConfig(level=logging.DEBUG)
+    # En production : pas de log par requête ni de DEBUG (coût non négligeable sur le Pi)
+    level = logging.INFO if production else logging.DEBUG
+    logging.basicConfig(level=level)
+    logging.getLogger().setLevel(level)
+    if production:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
     app.config['SECRET_KEY'] = 'dev_secret_key_toune_o_matic'
+    instrument_app(app)  # Latences par route + GET /metrics (Prometheus)
+    provider = json_provider()
+    if provider:
+        app.json = provider(app)  # jsonify via orjson s'il est installé
 
     # Enregistrement des Routes
     app.register_blueprint(audio_bp, url_prefix='/api/audio')
@@ -28,17 +42,23 @@ def create_app():
     app.register_blueprint(metadata_bp, url_prefix='/api/metadata')
     app.register_blueprint(bluetooth_bp, url_prefix='/api/bluetooth')
     app.register_blueprint(settings_bp, url_prefix='/api/settings') # <--- NOUVEAU
+    app.register_blueprint(library_bp)  # url_prefix défini dans le Blueprint (/api/library)
+
+    assets = AssetIndex.default()
 
     @app.route('/')
-    def index(): return app.send_static_file('index.html')
+    def index(): return assets.send('index.html', request.headers.get('Accept-Encoding', ''))
 
     @app.route('/<path:path>')
     def static_proxy(path):
-        if os.path.exists(os.path.join(app.static_folder, path)):
-            return app.send_static_file(path)
-        return app.send_static_file('index.html')
+        if path not in assets:
+            if path.startswith('api/'):
+                abort(404)
+            path = 'index.html'  # Routes de l'interface (SPA)
+        return assets.send(path, request.headers.get('Accept-Encoding', ''))
 
     @app.route('/api/status')
+    @micro_cache(ttl=0.5)
     def status():
         return jsonify({
             "status": {"state": "stop", "random": False, "repeat": False},
@@ -0,0 +1,112 @@
+# src/core/analysis.py
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+
+from src.core.dsp import SAMPLE_TYPES, unpack_samples
+
+logger = logging.getLogger("Analysis")
+
+# --- VU-MÈTRE / SPECTRE ---
+# Le thread audio ne fait que déposer un bloc dans une boîte à lettres (une
+# place, écrasée si le calcul n'a pas suivi) : il n'attend jamais. Le calcul
+# (RMS, crête, FFT) tourne dans un thread à part, au plus FPS fois par seconde.
+FPS = 20
+BANDS = 16
+F_MIN = 40.0
+FLOOR_DB = -90.0
+
+
+def _db(x):
+    return np.maximum(20 * np.log10(np.maximum(x, 1e-9)), FLOOR_DB)
+
+
+class LevelTap:
+    def __init__(self, fps=FPS, bands=BANDS):
+        self.interval = 1.0 / fps
+        self.bands = bands
+        self.stats = {"frames": 0, "skipped": 0, "dropped": 0}
+        self._next = 0.0
+        self._mailbox = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._edges = {}  # (taille, fréquence) -> bornes des bandes en indices FFT
+        self._thread = threading.Thread(target=self._worker, name="level-tap", daemon=True)
+        self._thread.start()
+
+    # --- Côté audio : jamais bloquant ---
+    def feed(self, data, fmt):
+        now = time.monotonic()
+        if now < self._next or not self._subscribers:
+            return
+        self._next = now + self.interval
+        if self._mailbox is not None:
+            self.stats["skipped"] += 1  # Calcul précédent pas encore fait : écrasé
+        self._mailbox = (bytes(data), fmt)
+        self._ready.set()
+
+    # --- Calcul ---
+    def _band_edges(self, n, rate):
+        key = (n, rate)
+        if key not in self._edges:
+            freqs = np.geomspace(F_MIN, rate / 2, self.bands + 1)
+            self._edges[key] = np.clip(np.round(freqs * n / rate).astype(int), 1, n // 2 + 1)
+        return self._edges[key]
+
+    def analyze(self, data, fmt):
+        peak_value = SAMPLE_TYPES[fmt.width][1] + 1
+        x = unpack_samples(data, fmt.width).reshape(-1, fmt.channels).astype(np.float32) / peak_value
+        rms = np.sqrt(np.mean(x * x, axis=0))
+        peak = np.abs(x).max(axis=0)
+
+        mono = x.mean(axis=1) * np.hanning(len(x)).astype(np.float32)
+        power = np.abs(np.fft.rfft(mono)) ** 2
+        edges = self._band_edges(len(mono), fmt.rate)
+        # Énergie par bande (bornes log), via sommes cumulées : pas de boucle Python
+        csum = np.concatenate(([0.0], np.cumsum(power)))
+        hi = np.minimum(np.maximum(edges[1:], edges[:-1] + 1), len(power))
+        bands = csum[hi] - csum[edges[:-1]]
+        scale = (len(mono) / 4) ** 2 * 1.5  # Sinus pleine échelle ~ 0 dB après fenêtre de Hann
+        return {
+            "t": round(time.time(), 3),
+            "rms": [round(float(v), 1) for v in _db(rms)],
+            "peak": [round(float(v), 1) for v in _db(peak)],
+            "spectrum": [round(float(v), 1) for v in _db(np.sqrt(bands / scale))],
+        }
+
+    def _worker(self):
+        while True:
+            self._ready.wait()
+            self._ready.clear()
+            item, self._mailbox = self._mailbox, None
+            if item is None:
+                continue
+            try:
+                frame = self.analyze(*item)
+            except Exception as e:
+                logger.error(f"Analyse impossible : {e}")
+                continue
+            self.stats["frames"] += 1
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for q in subscribers:
+                try:
+                    q.put_nowait(frame)
+                except queue.Full:
+                    self.stats["dropped"] += 1  # Client lent : il perd des images, pas le son
+
+    # --- Abonnés ---
+    def subscribe(self, maxsize=4):
+        q = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
@@ -0,0 +1,381 @@
+import logging
+import os
+import threading
+
+from src.core.config_manager import config_manager, parse_percent, parse_size
+from src.core.decoding import FfmpegStream, WavStream
+from src.core.dsp import GainStage, crossfade
+from src.core import decoding, pcm_cache
+from src.core.ringbuffer import RingBuffer
+from src.core.sinks import AlsaSink, QueuedSink, make_sink
+
+logger = logging.getLogger("AudioEngine")
+
+# Valeurs utilisées si la config est absente ou illisible
+DEFAULT_BUFFER = 8 * 1024 * 1024
+DEFAULT_PREBUFFER = 0.10
+# Plus petit tampon accepté : 8 périodes au pire format (8 canaux, 32 bits)
+MIN_BUFFER = 8 * 1024 * 8 * 4
+
+
+def replay_gain(filename):
+    """Gain de normalisation (dB) d'une piste de la bibliothèque, 0.0 sinon."""
+    if not config_manager.get("playback", "volume_normalization"):
+        return 0.0
+    try:
+        # Import tardif : la base n'est utile que si la normalisation est active
+        from src.core import metadata
+        from src.core.loudness import track_gain
+
+        root = os.path.abspath(metadata.MUSIC_PATH)
+        path = os.path.abspath(filename)
+        if os.path.commonpath([root, path]) != root:
+            return 0.0
+        return track_gain(os.path.relpath(path, root))
+    except Exception as e:
+        logger.warning(f"ReplayGain indisponible pour {filename}: {e}")
+        return 0.0
+
+
+class AudioEngine:
+    """
+    Lecture en deux threads : un producteur décode dans un tampon circulaire
+    de playback.buffer_size octets, et la sortie ALSA ne démarre qu'une fois
+    playback.buffer_before_play atteint. Un NAS lent est absorbé par le
+    tampon au lieu de couper le son.
+    """
+    PERIOD_FRAMES = 1024
+    # Au-delà, le PCM décodé n'est pas gardé en mémoire pour les répétitions
+    # (~6 min en 16/44.1 stéréo) : on relit le flux à la place.
+    MEMORY_REPLAY_MAX = 64 * 1024 * 1024
+
+    def __init__(self, device: str = "default", buffer_size=None, prebuffer=None, outputs=None, sink=None):
+        self.device = device
+        if buffer_size is None:
+            buffer_size = config_manager.get("playback", "buffer_size")
+        if prebuffer is None:
+            prebuffer = config_manager.get("playback", "buffer_before_play")
+        self.buffer_size = parse_size(buffer_size, DEFAULT_BUFFER)
+        if self.buffer_size < MIN_BUFFER:
+            # Un bloc décodé ne tiendrait pas dans le tampon : la lecture échouerait sans bruit
+            logger.warning(f"playback.buffer_size trop petit ({buffer_size}), "
+                           f"{DEFAULT_BUFFER // 1024 ** 2} MB utilisés")
+            self.buffer_size = DEFAULT_BUFFER
+        self.prebuffer = parse_percent(prebuffer, DEFAULT_PREBUFFER)
+        self.stats = {"underruns": 0, "xruns": 0, "frames": 0}
+        self._ring = None
+        # Piste en cours (étiquette), son format et la position en trames
+        self.now_playing = None
+        self.format = None
+        self.position = 0
+        self._resume = threading.Event()
+        self._resume.set()
+        # Analyse (VU / spectre) : objet avec feed(bloc, format), non bloquant
+        self.tap = None
+        # Cache PCM des clips courts ; désactivé pour les mesures (run.py bench)
+        self.use_pcm_cache = True
+        # Volume logiciel + ReplayGain (transparent à gain unité)
+        self.gain = GainStage.from_config()
+
+        # Sortie principale : elle donne le tempo (écriture bloquante).
+        # Sorties secondaires (dual_audio) : même PCM décodé une seule fois,
+        # chacune derrière sa file bornée pour ne jamais freiner les autres.
+        # sink : sortie de remplacement ('null', 'wav:x.wav' ou objet), p. ex. sans DAC
+        native = bool(config_manager.get("audio", "native_output"))
+        if isinstance(sink, str):
+            sink = make_sink(sink, self.PERIOD_FRAMES, native)
+        self.sink = sink or AlsaSink(device, self.PERIOD_FRAMES, native)
+        if outputs is None:
+            outputs = config_manager.get("audio", "extra_outputs") if config_manager.get("audio", "dual_audio") else []
+        self.outputs = [QueuedSink(make_sink(spec, self.PERIOD_FRAMES, native)) for spec in outputs or []]
+
+    def set_volume(self, volume):
+        self.gain.set_volume(volume)
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    @property
+    def paused(self):
+        return not self._resume.is_set()
+
+    def stop(self):
+        """Interrompt la lecture en cours (appelable depuis un autre thread)."""
+        ring = self._ring
+        if ring is not None:
+            ring.abort()
+        self._resume.set()
+
+    def close(self):
+        self.sink.close()
+        for out in self.outputs:
+            out.close()
+
+    def shutdown(self):
+        """Ferme toutes les sorties et arrête leurs threads."""
+        self.sink.close()
+        for out in self.outputs:
+            out.stop()
+
+    def buffer_stats(self):
+        """Compteurs de lecture : sous-alimentations du tampon, xruns ALSA, remplissage."""
+        ring = self._ring
+        return dict(
+            self.stats,
+            buffer_bytes=self.buffer_size,
+            prebuffer_bytes=int(self.buffer_size * self.prebuffer),
+            fill_bytes=ring.available if ring else 0,
+            dropped={str(out): out.dropped for out in self.outputs},
+        )
+
+    # --- Producteur ---
+    def _stream_blocks(self, stream):
+        data = stream.read(self.PERIOD_FRAMES)
+        while data:
+            yield data
+            data = stream.read(self.PERIOD_FRAMES)
+
+    def _memory_blocks(self, pcm, frame_bytes):
+        # Tranches memoryview : aucune allocation par période
+        view = memoryview(pcm)
+        chunk = self.PERIOD_FRAMES * frame_bytes
+        for i in range(0, len(view), chunk):
+            yield view[i : i + chunk]
+
+    def _capture_blocks(self, stream, capture):
+        """Blocs du flux, recopiés dans capture[0] tant qu'il reste sous MEMORY_REPLAY_MAX."""
+        for data in self._stream_blocks(stream):
+            buf = capture[0]
+            if buf is not None:
+                if len(buf) + len(data) > self.MEMORY_REPLAY_MAX:
+                    capture[0] = None
+                else:
+                    buf += data
+            yield data
+
+    def _repeat_segments(self, stream, filename, repeat=1, loop=False):
+        """
+        Segments (format, étiquette, blocs) d'une lecture éventuellement répétée.
+        Fichier court : PCM capturé au premier passage puis rejoué depuis la
+        mémoire (zéro CPU de décodage). Fichier long : le flux est rembobiné
+        (WAV : simple seek ; autres formats : ffmpeg est relancé).
+        """
+        fmt = stream.format
+        capture = [bytearray() if (repeat > 1 or loop) else None]
+
+        try:
+            yield fmt, (0, filename), self._capture_blocks(stream, capture)
+            pcm = capture[0]
+            if pcm is not None:
+                stream.close()  # Tout est en mémoire : plus besoin du décodeur
+                stream = None
+
+            done = 1
+            while loop or done < repeat:
+                if pcm is not None:
+                    yield fmt, (done, filename), self._memory_blocks(pcm, fmt.frame_bytes)
+                else:
+                    stream.rewind()
+                    yield fmt, (done, filename), self._stream_blocks(stream)
+                done += 1
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def _playlist_segments(self, filenames, start=0.0, replay=None):
+        """
+        replay(fichier) -> True si la même piste va suivre (boucle, répétition) :
+        son PCM est alors gardé en mémoire et rejoué sans redécoder, comme
+        dans _repeat_segments.
+        """
+        kept = None  # (fichier, format, PCM) de la piste précédente
+        for index, filename in enumerate(filenames):
+            if kept is not None and kept[0] == filename:
+                fmt, pcm = kept[1], kept[2]
+                if not replay(filename):
+                    kept = None
+                yield fmt, (index, filename), self._memory_blocks(pcm, fmt.frame_bytes)
+                continue
+            kept = None
+            try:
+                stream = self._open(filename, start if index == 0 else 0.0)
+            except Exception as e:
+                logger.error(f"Piste ignorée {filename}: {e}")
+                continue
+            # Pas de capture d'une piste reprise en cours (seek) : le PCM serait incomplet
+            capture = [bytearray()] if replay and not (index == 0 and start) and replay(filename) else None
+            try:
+                blocks = self._capture_blocks(stream, capture) if capture else self._stream_blocks(stream)
+                yield stream.format, (index, filename), blocks
+            finally:
+                stream.close()
+            if capture and capture[0] is not None:
+                kept = (filename, stream.format, capture[0])
+
+    def _crossfade_segments(self, filenames, seconds, curve, start=0.0):
+        """
+        Fondu enchaîné : les dernières secondes de chaque piste sont retenues
+        puis mélangées au début de la suivante. Une piste d'un autre format
+        est convertie par ffmpeg dans celui de la sortie ; sinon décodage natif.
+        """
+        fmt, tag, tail = None, None, b""
+        for index, filename in enumerate(filenames):
+            try:
+                stream = self._open(filename, start if index == 0 else 0.0)
+                if fmt is not None and stream.format != fmt:
+                    stream.close()
+                    stream = FfmpegStream(filename, fmt)
+            except Exception as e:
+                logger.error(f"Piste ignorée {filename}: {e}")
+                continue
+            fmt, tag = stream.format, (index, filename)
+            state = {"tail": tail}
+            try:
+                yield fmt, tag, self._fade_blocks(stream, state, int(seconds * fmt.rate), curve)
+            finally:
+                stream.close()
+            tail = state["tail"]
+        if tail:
+            # Fin de la dernière piste, sans fondu (même étiquette : pas de changement de piste)
+            yield fmt, tag, self._memory_blocks(tail, fmt.frame_bytes)
+
+    def _fade_blocks(self, stream, state, frames, curve):
+        fmt = stream.format
+        keep = frames * fmt.frame_bytes
+        pending = bytearray()
+        data = stream.read(self.PERIOD_FRAMES)
+
+        tail = state["tail"]
+        if tail:
+            while data and len(pending) < len(tail):
+                pending += data
+                data = stream.read(self.PERIOD_FRAMES)
+            yield from self._memory_blocks(crossfade(tail, pending[: len(tail)], fmt, curve), fmt.frame_bytes)
+            del pending[: len(tail)]
+
+        # Ligne à retard de keep octets : vidée par gros morceaux (copie amortie)
+        while data:
+            pending += data
+            if len(pending) >= 2 * keep + len(data):
+                cut = len(pending) - keep
+                yield from self._memory_blocks(pending[:cut], fmt.frame_bytes)
+                del pending[:cut]
+            data = stream.read(self.PERIOD_FRAMES)
+
+        cut = max(len(pending) - keep, 0)
+        state["tail"] = bytes(pending[cut:])
+        yield from self._memory_blocks(pending[:cut], fmt.frame_bytes)
+
+    def _produce(self, segments, ring):
+        """Thread de décodage : remplit le tampon aussi vite que la source le permet."""
+        try:
+            for fmt, tag, blocks in segments:
+                ring.start_segment(fmt, tag)
+                for data in blocks:
+                    if not ring.write(data):
+                        return  # Arrêt demandé
+        except Exception as e:
+            logger.error(f"Erreur de décodage : {e}")
+        finally:
+            segments.close()
+            ring.close()
+
+    # --- Consommateur ---
+    def _run(self, segments, on_track=None):
+        ring = RingBuffer(self.buffer_size)
+        # Plafonné sous la capacité : les blocs sont contigus, le tampon n'est jamais plein à 100 %
+        threshold = min(int(self.buffer_size * self.prebuffer), self.buffer_size // 2)
+        self._ring = ring
+        producer = threading.Thread(target=self._produce, args=(segments, ring),
+                                    name="audio-decode", daemon=True)
+        producer.start()
+
+        current = None
+        try:
+            ring.wait_available(threshold)
+            while True:
+                if ring.available == 0 and not ring.closed:
+                    # Le décodage n'a pas suivi : on re-remplit avant de repartir
+                    self.stats["underruns"] += 1
+                    logger.warning("Tampon vide, pré-remplissage...")
+                    ring.wait_available(threshold)
+                if not self._resume.is_set():
+                    # Pause : le device est libéré, puis rouvert à la reprise
+                    self.sink.close()
+                    self._resume.wait()
+                    if self.format is not None:
+                        self.sink.open(self.format)
+                fmt, tag, data = ring.read(self.PERIOD_FRAMES)
+                if not data:
+                    break
+                if tag != current:
+                    current = tag
+                    self.now_playing, self.format, self.position = tag, fmt, 0
+                    index, filename = tag
+                    print(f"Lecture : {filename} ({fmt})")
+                    # Même format : les sorties restent ouvertes telles quelles
+                    self.sink.open(fmt)
+                    for out in self.outputs:
+                        out.open(fmt)
+                    self.gain.set_replaygain(replay_gain(filename))
+                    if on_track:
+                        on_track(index, filename)
+                frames = len(data) // fmt.frame_bytes
+                block = self.gain.process(data, fmt)
+                for out in self.outputs:
+                    out.write(block)
+                if self.tap is not None:
+                    self.tap.feed(block, fmt)
+                written = self.sink.write(block)
+                # pyalsaaudio relance le PCM de lui-même après un xrun : une
+                # écriture incomplète est le seul signe visible d'un décrochage
+                if written is not None and 0 <= written < frames:
+                    self.stats["xruns"] += 1
+                self.stats["frames"] += frames
+                self.position += frames
+        finally:
+            ring.abort()
+            producer.join(timeout=2)
+            self._ring = None
+            self.now_playing = None
+
+    def _open(self, filename, start=0.0):
+        if self.use_pcm_cache:
+            return pcm_cache.open_stream(filename, start)
+        return decoding.open_stream(filename, start)
+
+    # --- Lecture ---
+    def play_wav(self, filename: str):
+        self._run(self._repeat_segments(WavStream(filename), filename))
+
+    def play_any_file(self, filename: str):
+        print(f"Décodage du fichier audio : {filename}")
+        # Ouvert ici et non dans le producteur : une erreur de format remonte à l'appelant
+        self._run(self._repeat_segments(self._open(filename), filename))
+
+    def play_file(self, filename: str, repeat: int = 1, loop: bool = False):
+        """Lecture répétée sans redécoder ni rouvrir le device entre deux passages."""
+        print(f"Décodage du fichier audio : {filename}")
+        stream = self._open(filename)
+        self._run(self._repeat_segments(stream, filename, max(int(repeat), 1), loop))
+
+    def play_playlist(self, filenames, on_track=None, crossfade_seconds=None, start=0.0, replay=None):
+        """
+        Lecture enchaînée sans blanc : la piste suivante est décodée dans le
+        tampon pendant que la courante joue, et le PCM reste ouvert tant que
+        le format ne change pas. Avec playback.crossfade > 0 : fondu enchaîné.
+        filenames peut être un générateur : il n'est consommé qu'au fil du décodage.
+        start : position de départ (secondes) dans la première piste.
+        replay : voir _playlist_segments (sans effet avec le fondu enchaîné).
+        """
+        if crossfade_seconds is None:
+            crossfade_seconds = float(config_manager.get("playback", "crossfade") or 0)
+        if crossfade_seconds > 0:
+            curve = config_manager.get("playback", "crossfade_curve") or "equal_power"
+            segments = self._crossfade_segments(iter(filenames), crossfade_seconds, curve, start)
+        else:
+            segments = self._playlist_segments(iter(filenames), start, replay)
+        self._run(segments, on_track=on_track)
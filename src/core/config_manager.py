@@ -1,7 +1,11 @@
 import json
 import os
+import re
 
 CONFIG_FILE = 'toune_settings.json'
+# Socket du lecteur persistant : partagée par run.py, le démon et l'API Web
+# (ici plutôt que dans player_daemon, qui charge NumPy et tout le moteur)
+PLAYER_SOCKET = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".state", "player.sock"))
 
 DEFAULT_CONFIG = {
     "system": {
@@ -12,11 +16,14 @@ DEFAULT_CONFIG = {
         "output_device": "jack",
         "mixer_type": "software",
         "dual_audio": False,
+        "native_output": True,  # Ouvre hw: au format natif du DAC (profil sondé) plutôt que plughw
+        "extra_outputs": [],    # Si dual_audio : 'alsa:hw:1,0', 'fifo:/tmp/snapfifo', 'file:/chemin.raw'
         # --- NOUVEAU: Options Volume ---
         "vol_startup": 40,      # Volume au démarrage
         "vol_max": 100,         # Limite max pour protéger les enceintes
         "vol_curve": "log",     # 'log' (naturel) ou 'linear'
-        "vol_steps": 5          # Saut de volume par clic
+        "vol_steps": 5,         # Saut de volume par clic
+        "engine_volume": None   # Volume logiciel du lecteur intégré (None = gain unité, bit-perfect)
     },
     "playback": {
         "buffer_size": "8 MB",
@@ -24,8 +31,23 @@ DEFAULT_CONFIG = {
         # --- NOUVEAU: Options Lecture ---
         "buffer_before_play": "10%", # Pour éviter les coupures au début
         "volume_normalization": False, # Égalisation du volume auto
+        "normalization_mode": "album", # 'album' (respecte l'album) ou 'track'
+        "normalization_target": -18,   # Niveau visé (LUFS)
+        "pcm_cache_size": "64 MB",     # Cache du PCM décodé des clips courts (0 = désactivé)
+        "crossfade": 0,                # Fondu enchaîné en secondes (0 = gapless)
+        "crossfade_curve": "equal_power", # 'equal_power' ou 'linear'
         "auto_update": False
     },
+    "metadata": {
+        # --- NOUVEAU: Préchargement des bios / photos d'artistes ---
+        "provider": None,       # Fournisseur (voir prefetcher.PROVIDERS) ; None = pas de préchargement
+        "workers": 2,           # Threads de préchargement
+        "rate_limit": 1.0       # Requêtes max par seconde (tous workers confondus)
+    },
+    "api": {
+        # Micro-cache des routes interrogées en boucle : {"system.stats": 5} (0 = désactivé)
+        "micro_cache_ttl": {}
+    },
     "plugins": {
         "metadata_fetcher": True,
         "cockpit_integration": True,
@@ -33,17 +55,43 @@ DEFAULT_CONFIG = {
     }
 }
 
+def parse_size(value, default=0):
+    """'8 MB' / '512 KB' / 1048576 -> octets"""
+    units = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+    if isinstance(value, (int, float)):
+        return int(value)
+    m = re.match(r"\s*([\d.]+)\s*([a-zA-Z]*)\s*$", str(value))
+    if not m or m.group(2).upper() not in units and m.group(2):
+        return default
+    return int(float(m.group(1)) * units.get(m.group(2).upper() or "B", 1))
+
+def parse_percent(value, default=0.0):
+    """'10%' / 10 / 0.1 -> fraction entre 0 et 1"""
+    try:
+        num = float(str(value).strip().rstrip("%"))
+    except (ValueError, TypeError):
+        return default
+    if num > 1 or str(value).strip().endswith("%"):
+        num /= 100.0
+    return min(max(num, 0.0), 1.0)
+
 class ConfigManager:
     def __init__(self):
-        self.config = DEFAULT_CONFIG
-        self.load()
+        self._config = None  # Fichier lu au premier accès, pas à l'import
+
+    @property
+    def config(self):
+        if self._config is None:
+            self.load()
+        return self._config
 
     def load(self):
+        self._config = DEFAULT_CONFIG
         if os.path.exists(CONFIG_FILE):
             try:
                 with open(CONFIG_FILE, 'r') as f:
                     saved = json.load(f)
-                    self._merge(self.config, saved)
+                    self._merge(self._config, saved)
             except Exception as e:
                 print(f"Erreur chargement config: {e}")
 
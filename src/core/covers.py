@@ -0,0 +1,181 @@
+# src/core/covers.py
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from src.core.db import DATA_DIR
+from src.core import metadata
+from src.core.metrics import cache_requests
+
+logger = logging.getLogger("Covers")
+
+# --- CACHE DES VIGNETTES ---
+# Les pochettes originales (souvent 1000x1000+) sont réduites une seule fois
+# puis servies depuis data/cache/thumbs.
+THUMB_SIZE = 150
+THUMB_QUALITY = 85
+THUMB_DIR = os.path.join(DATA_DIR, "cache", "thumbs")
+
+# --- CACHE DES MOSAÏQUES (SPRITES) ---
+# Une page de la grille d'albums = une seule image + une carte des positions.
+SPRITE_DIR = os.path.join(DATA_DIR, "cache", "sprites")
+SPRITE_COLUMNS = 10
+SPRITE_MAX_FILES = 200  # Au-delà, on purge les mosaïques les plus anciennes
+
+COVER_NAMES = ("cover.jpg", "folder.jpg", "front.jpg", "cover.png", "folder.png", "front.png")
+
+_build_lock = threading.Lock()
+
+
+def find_cover_source(path, album=""):
+    """Cherche la pochette originale (Documents/Pochettes, puis dossier de l'album)."""
+    if album:
+        candidate = os.path.join(metadata.FOLDERS["covers"], f"{album}.jpg")
+        if os.path.exists(candidate):
+            return candidate
+
+    if path:
+        full = os.path.join(metadata.MUSIC_PATH, path.lstrip("/"))
+        folder = full if os.path.isdir(full) else os.path.dirname(full)
+        for name in COVER_NAMES:
+            candidate = os.path.join(folder, name)
+            if os.path.exists(candidate):
+                return candidate
+    return None
+
+
+def _thumb_key(source):
+    st = os.stat(source)
+    raw = f"{source}|{st.st_mtime_ns}|{st.st_size}|{THUMB_SIZE}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_thumbnail(path, album=""):
+    """Renvoie le chemin de la vignette en cache (générée au besoin), ou None."""
+    source = find_cover_source(path, album)
+    if source is None:
+        return None
+
+    try:
+        key = _thumb_key(source)
+    except OSError:
+        return None
+
+    thumb = os.path.join(THUMB_DIR, f"{key}.jpg")
+    if os.path.exists(thumb):
+        cache_requests.inc(cache="thumbs", result="hit")
+        return thumb
+    cache_requests.inc(cache="thumbs", result="miss")
+
+    # Import ici : Pillow n'est nécessaire que pour générer les vignettes
+    from PIL import Image, ImageOps
+
+    os.makedirs(THUMB_DIR, exist_ok=True)
+    try:
+        with Image.open(source) as img:
+            img = ImageOps.fit(img.convert("RGB"), (THUMB_SIZE, THUMB_SIZE))
+            tmp = f"{thumb}.tmp"
+            img.save(tmp, "JPEG", quality=THUMB_QUALITY)
+            os.replace(tmp, thumb)
+    except Exception as e:
+        logger.warning(f"Vignette impossible pour {source}: {e}")
+        return None
+    return thumb
+
+
+def _sprite_key(thumbs):
+    """La clé de page dépend du contenu : une pochette modifiée donne une nouvelle mosaïque."""
+    names = [os.path.basename(t) if t else "-" for t in thumbs]
+    raw = json.dumps([THUMB_SIZE, SPRITE_COLUMNS, names])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def sprite_path(key):
+    return os.path.join(SPRITE_DIR, f"{key}.jpg")
+
+
+def _prune_sprites():
+    try:
+        files = [os.path.join(SPRITE_DIR, f) for f in os.listdir(SPRITE_DIR)]
+    except OSError:
+        return
+    if len(files) <= SPRITE_MAX_FILES * 2:  # .jpg + .json
+        return
+    files.sort(key=lambda f: os.path.getmtime(f))
+    for f in files[: len(files) - SPRITE_MAX_FILES * 2]:
+        try:
+            os.remove(f)
+        except OSError:
+            pass
+
+
+def build_sprite(items):
+    """
+    Construit (ou relit depuis le cache) la mosaïque d'une page d'albums.
+    items: liste de dicts {"path": ..., "album": ...}
+    Renvoie la carte: {"key", "tile", "columns", "width", "height", "offsets"}
+    où offsets[i] = {"x", "y"} ou None si l'album n'a pas de pochette.
+    """
+    thumbs = [get_thumbnail(i.get("path", ""), i.get("album", "")) for i in items]
+    key = _sprite_key(thumbs)
+    map_file = os.path.join(SPRITE_DIR, f"{key}.json")
+
+    if os.path.exists(map_file) and os.path.exists(sprite_path(key)):
+        cache_requests.inc(cache="sprites", result="hit")
+        with open(map_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    cache_requests.inc(cache="sprites", result="miss")
+
+    with _build_lock:
+        # Un autre thread a peut-être construit la même page entre-temps
+        if os.path.exists(map_file) and os.path.exists(sprite_path(key)):
+            with open(map_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        from PIL import Image
+
+        present = [t for t in thumbs if t]
+        count = max(len(present), 1)
+        columns = min(SPRITE_COLUMNS, count)
+        rows = (count + columns - 1) // columns
+        width, height = columns * THUMB_SIZE, rows * THUMB_SIZE
+
+        sheet = Image.new("RGB", (width, height), (30, 30, 30))
+        offsets = []
+        slot = 0
+        for thumb in thumbs:
+            if not thumb:
+                offsets.append(None)
+                continue
+            x = (slot % columns) * THUMB_SIZE
+            y = (slot // columns) * THUMB_SIZE
+            try:
+                with Image.open(thumb) as tile:
+                    sheet.paste(tile, (x, y))
+                offsets.append({"x": x, "y": y})
+                slot += 1
+            except Exception as e:
+                logger.warning(f"Vignette illisible {thumb}: {e}")
+                offsets.append(None)
+
+        sprite_map = {
+            "key": key,
+            "tile": THUMB_SIZE,
+            "columns": columns,
+            "width": width,
+            "height": height,
+            "offsets": offsets,
+        }
+
+        os.makedirs(SPRITE_DIR, exist_ok=True)
+        tmp = f"{sprite_path(key)}.tmp"
+        sheet.save(tmp, "JPEG", quality=THUMB_QUALITY)
+        os.replace(tmp, sprite_path(key))
+        with open(map_file, "w", encoding="utf-8") as f:
+            json.dump(sprite_map, f)
+
+        _prune_sprites()
+        logger.info(f"Mosaïque {key} générée ({slot} pochettes)")
+        return sprite_map
@@ -1,18 +1,74 @@
 import sqlite3
 import os
 import logging
+import threading
+import time
+from src.core.metrics import registry
 
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "library.db")
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+DB_PATH = os.path.join(DATA_DIR, "library.db")
 logger = logging.getLogger("DB")
 
-def get_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+query_time = registry.histogram("toune_sqlite_query_seconds", "Durée d'exécution des requêtes SQLite", ("op",))
+
+class TimedCursor(sqlite3.Cursor):
+    """Chronomètre execute/executemany (le premier pas de la requête, pas les fetch)."""
+    def _timed(self, method, sql, *args):
+        op = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "?"
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            query_time.observe(time.perf_counter() - start, op=op)
+
+    def execute(self, sql, *args):
+        return self._timed(super().execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return self._timed(super().executemany, sql, *args)
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute passe par un curseur C interne : on repasse par le nôtre
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+_ready = False
+_ready_lock = threading.Lock()
+
+def _connect():
+    conn = sqlite3.connect(DB_PATH, factory=TimedConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
+def get_db():
+    global _ready
+    if not _ready:
+        # Première connexion du processus (et non plus à l'import) : dossier,
+        # schéma et migration des bases existantes (colonnes ajoutées depuis).
+        # Les autres threads attendent la fin : _ready n'est levé qu'après.
+        with _ready_lock:
+            if not _ready:
+                os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+                init_db()
+                _ready = True
+    return _connect()
+
+def ensure_columns(conn, table, columns):
+    """Ajoute les colonnes manquantes (migration douce des bases existantes)."""
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
 def init_db():
-    conn = get_db()
+    """Crée ce qui manque (idempotent) ; appelé une fois par processus par get_db()."""
+    conn = _connect()
     c = conn.cursor()
     
     # Table principale des chansons
@@ -25,6 +81,16 @@ def init_db():
         duration INTEGER,
         year INTEGER
     )''')
+
+    # Analyse de volume (normalisation) : valeurs par piste et par album,
+    # avec le mtime du fichier analysé pour sauter les fichiers inchangés
+    ensure_columns(conn, "tracks", {
+        "mtime": "REAL",
+        "loudness": "REAL",
+        "peak": "REAL",
+        "album_loudness": "REAL",
+        "album_peak": "REAL",
+    })
     
     # Index pour recherche rapide (Full Text Search)
     # On crée une table virtuelle qui permet de chercher "Pink Floyd Wall" instantanément
@@ -44,10 +110,30 @@ def init_db():
       INSERT INTO tracks_fts(rowid, title, artist, album, genre, path) VALUES (new.rowid, new.title, new.artist, new.album, new.genre, new.path);
     END;''')
 
+    # Textes (biographies, critiques d'albums) indexés pour la recherche
+    c.execute('''CREATE TABLE IF NOT EXISTS documents (
+        path TEXT PRIMARY KEY,
+        kind TEXT,
+        name TEXT,
+        mtime REAL,
+        body TEXT
+    )''')
+    # remove_diacritics : "Montreal" trouve aussi "Montréal"
+    c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+        kind, name, body, content='documents', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+      INSERT INTO documents_fts(rowid, kind, name, body) VALUES (new.rowid, new.kind, new.name, new.body);
+    END;''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+      INSERT INTO documents_fts(documents_fts, rowid, kind, name, body) VALUES('delete', old.rowid, old.kind, old.name, old.body);
+    END;''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+      INSERT INTO documents_fts(documents_fts, rowid, kind, name, body) VALUES('delete', old.rowid, old.kind, old.name, old.body);
+      INSERT INTO documents_fts(rowid, kind, name, body) VALUES (new.rowid, new.kind, new.name, new.body);
+    END;''')
+
     conn.commit()
     conn.close()
     logger.info("Base de données initialisée.")
-
-# Initialiser au chargement du module si pas fait
-if not os.path.exists(DB_PATH):
-    init_db()
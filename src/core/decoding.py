@@ -0,0 +1,246 @@
+# src/core/decoding.py
+import json
+import mmap
+import os
+import struct
+import subprocess
+from dataclasses import dataclass
+
+# Décodage en flux via ffmpeg : on lit le PCM bloc par bloc sur un pipe,
+# sans jamais charger le fichier complet en mémoire (contrairement à pydub).
+FFMPEG = "ffmpeg"
+FFPROBE = "ffprobe"
+
+
+def ffmpeg_pipe(path, sample_fmt="s16le", channels=None, rate=None, start=None):
+    """Lance ffmpeg et renvoie le processus ; le PCM brut sort sur stdout."""
+    cmd = [FFMPEG, "-nostdin", "-v", "error"]
+    if start:
+        cmd += ["-ss", f"{float(start):.3f}"]  # Avant -i : saut rapide dans le fichier
+    cmd += ["-i", path, "-vn", "-f", sample_fmt]
+    if channels:
+        cmd += ["-ac", str(channels)]
+    if rate:
+        cmd += ["-ar", str(rate)]
+    cmd.append("pipe:1")
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def iter_pcm(path, block_bytes=262144, sample_fmt="s16le", channels=None, rate=None):
+    """Itère sur des blocs de PCM brut (taille fixe, sauf le dernier)."""
+    proc = ffmpeg_pipe(path, sample_fmt=sample_fmt, channels=channels, rate=rate)
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            yield data
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+# --- FORMAT PCM ---
+@dataclass(frozen=True)
+class PcmFormat:
+    channels: int
+    rate: int
+    width: int  # Octets par échantillon (3 = 24 bits "packed")
+
+    @property
+    def frame_bytes(self):
+        return self.channels * self.width
+
+    def __str__(self):
+        return f"{self.channels} ch, {self.rate} Hz, {self.width * 8} bits"
+
+
+# Largeur d'échantillon -> format de sortie ffmpeg
+SAMPLE_FMTS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+
+def _flac_format(path):
+    """Lit le bloc STREAMINFO directement (pas de ffprobe : démarrage plus rapide)."""
+    with open(path, "rb") as f:
+        head = f.read(4 + 4 + 34)
+    if len(head) < 42 or head[:4] != b"fLaC" or (head[4] & 0x7F) != 0:
+        return None
+    bits = int.from_bytes(head[8 + 10:8 + 18], "big")
+    rate = bits >> 44
+    channels = ((bits >> 41) & 0x7) + 1
+    bps = ((bits >> 36) & 0x1F) + 1
+    return PcmFormat(channels=channels, rate=rate, width=(bps + 7) // 8)
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _wav_layout(path):
+    """
+    Parcourt les chunks RIFF : renvoie (format, début et taille du chunk 'data'),
+    ou None si ce n'est pas du PCM entier (WAV flottant : ffmpeg s'en charge).
+    """
+    try:
+        with open(path, "rb") as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+                return None
+            file_size = os.fstat(f.fileno()).st_size
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+                if chunk_id == b"fmt ":
+                    body = f.read(size)
+                    tag, channels, rate = struct.unpack("<HHI", body[:8])
+                    bits = struct.unpack("<H", body[14:16])[0]
+                    if tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                        tag = struct.unpack("<H", body[24:26])[0]  # Sous-format
+                    if tag != WAVE_FORMAT_PCM:
+                        return None
+                    fmt = PcmFormat(channels=channels, rate=rate, width=(bits + 7) // 8)
+                    if size % 2:
+                        f.seek(1, os.SEEK_CUR)
+                elif chunk_id == b"data":
+                    if fmt is None:
+                        return None
+                    offset = f.tell()
+                    # Taille 0 / 0xFFFFFFFF : fichier écrit en flux, on prend la fin du fichier
+                    size = min(size or file_size, file_size - offset)
+                    return fmt, offset, size - size % fmt.frame_bytes
+                else:
+                    f.seek(size + (size % 2), os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+
+
+def _wav_format(path):
+    layout = _wav_layout(path)
+    return layout[0] if layout else None
+
+
+def _ffprobe_format(path):
+    cmd = [FFPROBE, "-v", "error", "-select_streams", "a:0", "-show_entries",
+           "stream=channels,sample_rate,sample_fmt,bits_per_raw_sample", "-of", "json", path]
+    r = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    streams = json.loads(r.stdout or "{}").get("streams") or []
+    if not streams:
+        raise ValueError(f"Aucun flux audio dans {path}")
+    s = streams[0]
+    bits = int(s.get("bits_per_raw_sample") or 0)
+    if not bits:
+        # Formats avec pertes (mp3, aac...) : 16 bits suffisent
+        bits = {"u8": 8, "u8p": 8, "s32": 32, "s32p": 32}.get(s.get("sample_fmt"), 16)
+    return PcmFormat(channels=int(s["channels"]), rate=int(s["sample_rate"]), width=(bits + 7) // 8)
+
+
+def probe_format(path):
+    """Format PCM natif du fichier (en-tête lu nativement pour WAV / FLAC)."""
+    ext = os.path.splitext(path)[1].lower()
+    fmt = None
+    if ext == ".wav":
+        fmt = _wav_format(path)
+    elif ext == ".flac":
+        fmt = _flac_format(path)
+    return fmt or _ffprobe_format(path)
+
+
+# --- FLUX DE DÉCODAGE ---
+class WavStream:
+    """
+    WAV PCM lu directement depuis un mmap du chunk 'data' : read() renvoie des
+    tranches memoryview du fichier projeté, sans aucune copie ni décodage.
+    """
+
+    def __init__(self, path):
+        layout = _wav_layout(path)
+        if layout is None:
+            raise ValueError(f"WAV PCM invalide : {path}")
+        self.format, self._offset, self._size = layout
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+        self._view = memoryview(self._map) if self._map else memoryview(b"")
+        self._pos = self._offset
+
+    def read(self, frames):
+        end = min(self._pos + frames * self.format.frame_bytes, self._offset + self._size)
+        if end <= self._pos:
+            return b""
+        chunk = self._view[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def rewind(self):
+        self._pos = self._offset
+
+    def seek(self, seconds):
+        frame = int(max(seconds, 0) * self.format.rate)
+        self._pos = min(self._offset + frame * self.format.frame_bytes, self._offset + self._size)
+
+    def close(self):
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Une tranche est encore référencée : fermé par le GC
+        self._file.close()
+
+
+class FfmpegStream:
+    """Tout autre format : PCM lu au fil de l'eau sur le pipe de ffmpeg."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.format = fmt
+        self._buf = bytearray()
+        self._proc = self._spawn()
+
+    def _spawn(self, start=None):
+        return ffmpeg_pipe(self.path, sample_fmt=SAMPLE_FMTS[self.format.width],
+                           channels=self.format.channels, rate=self.format.rate, start=start)
+
+    def read(self, frames):
+        """Lit dans un tampon réutilisé ; la vue renvoyée est valable jusqu'au prochain read()."""
+        size = frames * self.format.frame_bytes
+        if len(self._buf) != size:
+            self._buf = bytearray(size)
+        n = self._proc.stdout.readinto(self._buf)
+        return memoryview(self._buf)[:n] if n else b""
+
+    def rewind(self):
+        """Repart du début (nouveau processus ffmpeg : un pipe ne se rembobine pas)."""
+        self.close()
+        self._proc = self._spawn()
+
+    def seek(self, seconds):
+        self.close()
+        self._proc = self._spawn(start=seconds)
+
+    def close(self):
+        self._proc.stdout.close()
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+
+
+def open_stream(path, start=0.0):
+    """
+    Ouvre un flux PCM au format natif du fichier (à partir de start secondes).
+    Mémoire constante quelle que soit la durée.
+    """
+    if os.path.splitext(path)[1].lower() == ".wav" and _wav_format(path):
+        stream = WavStream(path)
+    else:
+        stream = FfmpegStream(path, probe_format(path))
+    if stream.format.width not in SAMPLE_FMTS:
+        stream.close()
+        raise ValueError(f"Unsupported sample width: {stream.format.width}")
+    if start:
+        stream.seek(start)
+    return stream
@@ -0,0 +1,157 @@
+# src/core/device_profiles.py
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from src.core.db import DATA_DIR
+
+logger = logging.getLogger("DeviceProfiles")
+
+# --- PROFILS DES CARTES SON ---
+# Chaque carte est sondée une seule fois (formats, fréquences, canaux,
+# période) puis le résultat est gardé dans data/cache, indexé par l'id ALSA
+# de la carte (stable, contrairement à son numéro qui change selon l'ordre USB).
+PROFILE_FILE = os.path.join(DATA_DIR, "cache", "alsa_profiles.json")
+
+PROBE_RATES = (44100, 48000, 88200, 96000, 176400, 192000, 352800, 384000)
+PROBE_WIDTHS = (4, 3, 2)           # Octets par échantillon, du plus large au plus étroit
+PROBE_CHANNELS = (1, 2, 4, 6, 8)
+PERIOD_MS = 20                     # Période visée : compromis latence / réveils CPU
+
+_HW_RE = re.compile(r"^(plug)?hw:(?:CARD=)?([^,]+)(?:,(?:DEV=)?(\d+))?$")
+_lock = threading.Lock()
+_profiles = None
+
+
+def parse_device(device):
+    """'plughw:1,0' / 'hw:CARD=DAC,DEV=0' -> (id de carte, n° de device), None si non matériel."""
+    m = _HW_RE.match(device or "")
+    if not m:
+        return None
+    card, dev = m.group(2), int(m.group(3) or 0)
+    if card.isdigit():
+        try:
+            with open(f"/proc/asound/card{card}/id") as f:
+                card = f.read().strip()
+        except OSError:
+            return None
+    return card, dev
+
+
+def _key(card, dev):
+    return f"{card}:{dev}"
+
+
+def _load():
+    global _profiles
+    if _profiles is None:
+        try:
+            with open(PROFILE_FILE) as f:
+                _profiles = json.load(f)
+        except (OSError, ValueError):
+            _profiles = {}
+    return _profiles
+
+
+def _save():
+    os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
+    tmp = PROFILE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(_profiles, f, indent=2)
+    os.replace(tmp, PROFILE_FILE)
+
+
+def _try_open(alsaaudio, device, channels, rate, width, periodsize):
+    from src.core.sinks import alsa_formats
+
+    try:
+        pcm = alsaaudio.PCM(type=alsaaudio.PCM_PLAYBACK, mode=alsaaudio.PCM_NONBLOCK, device=device,
+                            channels=channels, rate=rate, format=alsa_formats()[width], periodsize=periodsize)
+    except alsaaudio.ALSAAudioError:
+        return None
+    try:
+        # pyalsaaudio >= 0.10 : paramètres réellement accordés par le pilote
+        info = pcm.info() if hasattr(pcm, "info") else {}
+    except Exception:
+        info = {}
+    finally:
+        pcm.close()
+    if info.get("rate", rate) != rate or info.get("channels", channels) != channels:
+        return None  # Le pilote a substitué une valeur voisine : pas natif
+    return info
+
+
+def probe(card, dev=0):
+    """Ouvre hw:card,dev avec chaque combinaison ; None si la carte est occupée ou absente."""
+    import alsaaudio
+
+    device = f"hw:CARD={card},DEV={dev}"
+    formats, best = {}, None
+    for width in PROBE_WIDTHS:
+        for rate in PROBE_RATES:
+            info = _try_open(alsaaudio, device, 2, rate, width, rate * PERIOD_MS // 1000)
+            if info is not None:
+                formats.setdefault(str(width), []).append(rate)
+                if best is None:
+                    best = info
+    if not formats:
+        return None
+
+    width = int(next(iter(formats)))
+    rate = formats[str(width)][0]
+    channels = [c for c in PROBE_CHANNELS
+                if c == 2 or _try_open(alsaaudio, device, c, rate, width, 1024) is not None]
+    return {
+        "card": card,
+        "device": device,
+        "formats": formats,            # Largeur (octets) -> fréquences natives
+        "channels": channels,
+        "period_ms": PERIOD_MS,
+        "period_size": (best or {}).get("period_size"),
+        "buffer_size": (best or {}).get("buffer_size"),
+        "probed_at": int(time.time()),
+    }
+
+
+def get_profile(device, refresh=False):
+    """Profil de la carte derrière device (sondée au premier appel), None si non matérielle."""
+    parsed = parse_device(device)
+    if parsed is None:
+        return None
+    key = _key(*parsed)
+    with _lock:
+        profiles = _load()
+        if key in profiles and not refresh:
+            return profiles[key]
+        try:
+            profile = probe(*parsed)
+        except Exception as e:
+            logger.warning(f"Sondage de {device} impossible : {e}")
+            profile = None
+        if profile is None:
+            return profiles.get(key)  # Occupée : on garde l'ancien profil s'il existe
+        profiles[key] = profile
+        _save()
+        logger.info(f"Profil ALSA {key} : {profile['formats']}")
+        return profile
+
+
+def plan_output(device, fmt):
+    """
+    Choisit comment ouvrir la sortie pour un format donné : (device, largeur, période).
+    Si la carte accepte nativement la fréquence, on ouvre hw: directement (pas de
+    conversion ni de rééchantillonnage par plughw), en élargissant au besoin les
+    échantillons (16 -> 24/32 bits, sans perte). Sinon on garde le device configuré.
+    """
+    profile = get_profile(device)
+    default = (device, fmt.width, 1024)
+    if profile is None or fmt.channels not in profile["channels"]:
+        return default
+    for width in sorted(int(w) for w in profile["formats"]):
+        if width >= fmt.width and fmt.rate in profile["formats"][str(width)]:
+            period = max(64, fmt.rate * profile.get("period_ms", PERIOD_MS) // 1000)
+            return profile["device"], width, period
+    return default
@@ -0,0 +1,135 @@
+# src/core/docs_index.py
+import html
+import logging
+import os
+import threading
+import time
+
+from src.core import metadata
+from src.core.db import get_db, init_db
+
+logger = logging.getLogger("DocsIndex")
+
+# Type de document -> clé du dossier dans metadata.FOLDERS
+DOC_KINDS = {"bio": "bios", "review": "reviews"}
+
+# Intervalle minimal entre deux vérifications des fichiers (le NAS est lent)
+SYNC_INTERVAL = 60
+
+_sync_lock = threading.Lock()
+_last_sync = 0.0
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def index_file(kind, path, conn=None):
+    """(Ré)indexe un seul fichier texte. Utilisé après une écriture du préchargement."""
+    own = conn is None
+    if own:
+        init_db()
+        conn = get_db()
+    try:
+        mtime = os.path.getmtime(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        conn.execute(
+            "INSERT INTO documents (path, kind, name, mtime, body) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET kind=excluded.kind, name=excluded.name, "
+            "mtime=excluded.mtime, body=excluded.body",
+            (path, kind, name, mtime, _read_text(path))
+        )
+        if own:
+            conn.commit()
+    finally:
+        if own:
+            conn.close()
+
+
+def sync_documents():
+    """Synchronise l'index avec les dossiers : ajouts, modifications (mtime) et suppressions."""
+    global _last_sync
+    if not _sync_lock.acquire(blocking=False):
+        return {"ok": False, "error": "Synchronisation déjà en cours"}
+    try:
+        start_t = time.time()
+        init_db()
+        conn = get_db()
+        known = {r["path"]: r["mtime"] for r in conn.execute("SELECT path, mtime FROM documents")}
+        seen = set()
+        updated = 0
+
+        for kind, folder_key in DOC_KINDS.items():
+            folder = metadata.FOLDERS[folder_key]
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(".txt"):
+                    continue
+                seen.add(entry.path)
+                if known.get(entry.path) == entry.stat().st_mtime:
+                    continue
+                try:
+                    index_file(kind, entry.path, conn)
+                    updated += 1
+                except OSError as e:
+                    logger.warning(f"Lecture impossible {entry.path}: {e}")
+
+        removed = [p for p in known if p not in seen]
+        conn.executemany("DELETE FROM documents WHERE path = ?", [(p,) for p in removed])
+        conn.commit()
+        conn.close()
+
+        _last_sync = time.time()
+        if updated or removed:
+            logger.info(f"Index documents : {updated} mis à jour, {len(removed)} supprimés "
+                        f"en {time.time() - start_t:.2f}s")
+        return {"ok": True, "updated": updated, "removed": len(removed)}
+    finally:
+        _sync_lock.release()
+
+
+def sync_if_stale():
+    """Lance une synchronisation en tâche de fond si la dernière date de plus de SYNC_INTERVAL."""
+    if time.time() - _last_sync < SYNC_INTERVAL or _sync_lock.locked():
+        return
+    threading.Thread(target=sync_documents, name="docs-sync", daemon=True).start()
+
+
+def fts_query(q):
+    """Transforme la saisie utilisateur en requête FTS5 sûre (chaque mot en préfixe, ET implicite)."""
+    terms = [t.replace('"', "") for t in q.split()]
+    return " ".join(f'"{t}"*' for t in terms if t)
+
+
+def search_documents(q, limit=20):
+    """
+    Recherche dans les bios / critiques, avec un extrait surligné.
+    Le texte vient de fichiers et de fournisseurs externes : l'extrait est
+    échappé en HTML, seuls les <b> du surlignage sont ajoutés ensuite.
+    """
+    query = fts_query(q)
+    if not query:
+        return []
+    conn = get_db()
+    try:
+        rows = conn.execute(
+            "SELECT d.kind, d.name, d.path, "
+            "snippet(documents_fts, 2, char(2), char(3), '…', 12) AS snippet "
+            "FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid "
+            "WHERE documents_fts MATCH ? ORDER BY rank LIMIT ?",
+            (query, limit)
+        ).fetchall()
+    except Exception as e:
+        # Table absente (base jamais synchronisée) ou requête invalide
+        logger.warning(f"Recherche documents impossible: {e}")
+        return []
+    finally:
+        conn.close()
+    results = [dict(r) for r in rows]
+    for r in results:
+        r["snippet"] = html.escape(r["snippet"] or "").replace("\x02", "<b>").replace("\x03", "</b>")
+    return results
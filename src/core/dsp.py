@@ -0,0 +1,181 @@
+# src/core/dsp.py
+import math
+import time
+
+import numpy as np
+
+from src.core.config_manager import config_manager
+
+# --- VOLUME LOGICIEL ---
+# Courbe 'log' : le curseur est linéaire en dB sur VOL_RANGE_DB (0 = muet),
+# ce qui correspond à la sensation de volume. Courbe 'linear' : amplitude brute.
+VOL_RANGE_DB = 60.0
+
+# Largeur d'échantillon -> (type NumPy, valeur max, dither)
+# En 32 bits, le bruit de quantification est bien sous le plancher de tout DAC : pas de dither.
+SAMPLE_TYPES = {
+    1: (np.uint8, 127, True),
+    2: (np.int16, 32767, True),
+    3: (np.int32, 8388607, True),
+    4: (np.int32, 2147483647, False),
+}
+
+
+def volume_to_gain(volume, curve="log", vol_max=100):
+    """Volume 0-100 (borné par vol_max) -> facteur d'amplitude."""
+    volume = min(max(float(volume), 0.0), float(vol_max), 100.0)
+    if volume <= 0:
+        return 0.0
+    if curve == "linear":
+        return volume / 100.0
+    return 10 ** ((volume / 100.0 - 1.0) * VOL_RANGE_DB / 20.0)
+
+
+def unpack_samples(data, width):
+    """Octets PCM -> entiers (24 bits packed élargis en int32, signe conservé)."""
+    if width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8)
+        wide = np.zeros((len(raw) // 3, 4), dtype=np.uint8)
+        wide[:, 1:] = raw[: len(raw) - len(raw) % 3].reshape(-1, 3)
+        return wide.view("<i4").ravel() >> 8
+    dtype = SAMPLE_TYPES[width][0]
+    x = np.frombuffer(data, dtype=dtype, count=len(data) // width)
+    if width == 1:
+        return x.astype(np.int16) - 128
+    return x
+
+
+def pack_samples(x, width):
+    if width == 3:
+        return x.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    if width == 1:
+        return (x + 128).astype(np.uint8).tobytes()
+    return x.astype(SAMPLE_TYPES[width][0]).tobytes()
+
+
+def widen(data, width, target):
+    """Élargit les échantillons (ex. 16 -> 32 bits) sans perte, pour un DAC qui n'accepte que le format large."""
+    x = unpack_samples(data, width).astype(np.int64 if target == 4 else np.int32)
+    return pack_samples(x << (8 * (target - width)), target)
+
+
+class GainStage:
+    """
+    Étage de gain appliqué aux blocs PCM avant la sortie : volume logiciel
+    (courbe log/linéaire, plafond vol_max) et gain ReplayGain de la piste.
+    Gain unité -> le bloc passe tel quel (bit-perfect, aucun calcul).
+    """
+
+    def __init__(self, volume=100, curve="log", vol_max=100, replaygain_db=0.0, dither=True):
+        self.curve = curve
+        self.vol_max = vol_max
+        self.volume = volume
+        self.replaygain_db = replaygain_db
+        self.dither = dither
+        self._rng = np.random.default_rng()
+        self._update()
+
+    @classmethod
+    def from_config(cls):
+        def get(key, default):
+            value = config_manager.get("audio", key)
+            return default if value is None else value
+
+        if get("mixer_type", "software") != "software":
+            # Mixer matériel : le volume est géré par ALSA, seul le ReplayGain reste ici
+            return cls(curve=get("vol_curve", "log"))
+        # vol_startup est le volume de départ de MPD : le lecteur intégré reste
+        # au gain unité tant qu'engine_volume n'est pas réglé
+        return cls(volume=get("engine_volume", 100), curve=get("vol_curve", "log"), vol_max=get("vol_max", 100))
+
+    def _update(self):
+        self.factor = volume_to_gain(self.volume, self.curve, self.vol_max) * 10 ** (self.replaygain_db / 20.0)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self._update()
+
+    def set_replaygain(self, gain_db):
+        self.replaygain_db = gain_db or 0.0
+        self._update()
+
+    def process(self, data, fmt):
+        """Applique le gain à un bloc (bytes / memoryview) ; renvoie le bloc à écrire."""
+        if self.factor == 1.0 or fmt.width not in SAMPLE_TYPES:
+            return data
+        _, peak, dither = SAMPLE_TYPES[fmt.width]
+        if self.factor == 0.0:
+            return bytes(len(data)) if fmt.width != 1 else b"\x80" * len(data)
+
+        x = unpack_samples(data, fmt.width)
+        # float32 suffit jusqu'à 24 bits (mantisse de 24 bits) ; float64 pour le 32 bits
+        y = x.astype(np.float64 if fmt.width == 4 else np.float32)
+        y *= self.factor
+        if dither and self.dither:
+            # Dither TPDF de ±1 LSB : masque la distorsion de requantification
+            y += self._rng.random(len(y), dtype=np.float32)
+            y -= self._rng.random(len(y), dtype=np.float32)
+        np.rint(y, out=y)
+        np.clip(y, -peak - 1, peak, out=y)
+        return pack_samples(y.astype(np.int64 if fmt.width == 4 else np.int32), fmt.width)
+
+
+# --- FONDU ENCHAÎNÉ ---
+def fade_curves(frames, curve="equal_power"):
+    """Rampes (sortante, entrante) sur frames trames. Puissance constante ou linéaire."""
+    t = (np.arange(frames, dtype=np.float64) + 0.5) / max(frames, 1)
+    if curve == "linear":
+        return (1.0 - t).astype(np.float32), t.astype(np.float32)
+    return np.cos(t * np.pi / 2).astype(np.float32), np.sin(t * np.pi / 2).astype(np.float32)
+
+
+def crossfade(tail, head, fmt, curve="equal_power"):
+    """
+    Mélange la fin d'une piste et le début de la suivante (même format),
+    à l'échantillon près. La plus courte est complétée par du silence.
+    """
+    a = unpack_samples(tail, fmt.width).reshape(-1, fmt.channels)
+    b = unpack_samples(head, fmt.width).reshape(-1, fmt.channels)
+    frames = max(len(a), len(b))
+    dtype = np.float64 if fmt.width == 4 else np.float32
+    out = np.zeros((frames, fmt.channels), dtype=dtype)
+    fade_out, fade_in = fade_curves(frames, curve)
+    out[: len(a)] += a * fade_out[: len(a), None]
+    out[: len(b)] += b * fade_in[: len(b), None]
+    peak = SAMPLE_TYPES[fmt.width][1]
+    np.rint(out, out=out)
+    np.clip(out, -peak - 1, peak, out=out)
+    return pack_samples(out.ravel().astype(np.int64 if fmt.width == 4 else np.int32), fmt.width)
+
+
+def benchmark(fmt, frames=1024, iterations=200):
+    """
+    Coût moyen d'un bloc (µs) comparé au budget d'une période à ce format.
+    Sur un Pi Zero, la charge doit rester bien en dessous de 100 %.
+    """
+    stage = GainStage(volume=70)
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, frames * fmt.frame_bytes, dtype=np.uint8).tobytes()
+    stage.process(data, fmt)  # Préchauffage
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        stage.process(data, fmt)
+    per_block = (time.perf_counter() - start) / iterations * 1e6
+    budget = frames / fmt.rate * 1e6
+    return {
+        "format": str(fmt),
+        "block_us": round(per_block, 1),
+        "budget_us": round(budget, 1),
+        "load_percent": round(100 * per_block / budget, 2),
+    }
+
+
+# Mesure rapide si lancé directement
+if __name__ == "__main__":
+    from src.core.decoding import PcmFormat
+
+    for width in (2, 3, 4):
+        for rate in (44100, 96000):
+            print(benchmark(PcmFormat(channels=2, rate=rate, width=width)))
+    print(f"Gain à 50 % (log) : {20 * math.log10(volume_to_gain(50)):.1f} dB")
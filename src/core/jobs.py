@@ -0,0 +1,72 @@
+# src/core/jobs.py
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("Jobs")
+
+# Tâches longues (analyse de la bibliothèque) : une seule instance par nom
+_jobs = {}
+_lock = threading.Lock()
+
+
+def default_workers():
+    """Laisse un cœur libre pour la lecture et l'API."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def run_batch(fn, items, workers=None, on_result=None):
+    """
+    Exécute fn(item) dans un pool de processus (le décodage est lié au CPU,
+    les threads seraient bridés par le GIL). on_result(item, résultat) est
+    appelé dans le processus parent, au fil de l'eau.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    done = errors = 0
+    items = list(items)
+    if not items:
+        return {"done": 0, "errors": 0}
+
+    with ProcessPoolExecutor(max_workers=workers or default_workers()) as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+        for fut in as_completed(futures):
+            item = futures[fut]
+            try:
+                result = fut.result()
+                if on_result:
+                    on_result(item, result)
+                done += 1
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Échec sur {item}: {e}")
+    return {"done": done, "errors": errors}
+
+
+def start_job(name, target, *args):
+    """Lance target(*args) dans un thread. Renvoie False si la tâche tourne déjà."""
+    with _lock:
+        job = _jobs.get(name)
+        if job and job["running"]:
+            return False
+        job = {"running": True, "started": time.time(), "finished": None, "result": None}
+        _jobs[name] = job
+
+    def run():
+        try:
+            job["result"] = target(*args)
+        except Exception as e:
+            logger.error(f"Tâche {name} en échec: {e}")
+            job["result"] = {"ok": False, "error": str(e)}
+        finally:
+            job["finished"] = time.time()
+            job["running"] = False
+
+    threading.Thread(target=run, name=f"job-{name}", daemon=True).start()
+    return True
+
+
+def job_status():
+    with _lock:
+        return {name: dict(job) for name, job in _jobs.items()}
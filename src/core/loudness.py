@@ -0,0 +1,220 @@
+# src/core/loudness.py
+import logging
+import math
+import os
+import time
+
+from src.core.config_manager import config_manager
+from src.core.db import get_db, init_db
+from src.core.decoding import iter_pcm
+from src.core.jobs import run_batch
+from src.core.waveform import music_file
+
+logger = logging.getLogger("Loudness")
+
+# --- MESURE DE VOLUME (inspirée de l'ITU-R BS.1770 / EBU R128) ---
+# Décodage à 48 kHz stéréo : les coefficients de la pondération K sont
+# ceux de la norme à cette fréquence.
+ANALYSIS_RATE = 48000
+SUB_BLOCK = ANALYSIS_RATE // 10   # 100 ms
+BLOCK_SUBS = 4                    # Bloc de 400 ms, recouvrement 75 %
+ABSOLUTE_GATE = -70.0             # LUFS
+RELATIVE_GATE = -10.0             # LU sous le niveau non filtré
+
+# Pondération K (2 biquads) à 48 kHz
+K_SHELF = ([1.53512485958697, -2.69169618940638, 1.19839281085285],
+           [1.0, -1.69065929318241, 0.73248077421585])
+K_HIGHPASS = ([1.0, -2.0, 1.0],
+              [1.0, -1.99004745483398, 0.99007225036621])
+
+
+class _KWeighting:
+    """
+    Filtre K avec état conservé entre les blocs. scipy est obligatoire : une
+    mesure non pondérée s'écarterait d'environ 1 dB, et les valeurs stockées
+    ne seraient plus comparables d'une machine à l'autre.
+    """
+
+    def __init__(self, channels=2):
+        import numpy as np
+        from scipy.signal import lfilter
+
+        self._lfilter = lfilter
+        self._zi = [np.zeros((2, channels)), np.zeros((2, channels))]
+
+    def __call__(self, x):
+        for i, (b, a) in enumerate((K_SHELF, K_HIGHPASS)):
+            x, self._zi[i] = self._lfilter(b, a, x, axis=0, zi=self._zi[i])
+        return x
+
+
+def analyze_track(path):
+    """
+    Tâche du pool : décode la piste en flux et renvoie
+    (mtime, puissances par sous-bloc de 100 ms, pic échantillon).
+    """
+    import numpy as np
+
+    filename = music_file(path)
+    mtime = os.path.getmtime(filename)
+    k_filter = _KWeighting(channels=2)
+    powers = []
+    peak = 0.0
+    carry = np.empty((0, 2), dtype=np.float64)
+
+    for data in iter_pcm(filename, block_bytes=SUB_BLOCK * 8 * 50, sample_fmt="f32le",
+                         channels=2, rate=ANALYSIS_RATE):
+        x = np.frombuffer(data, dtype=np.float32, count=len(data) // 4)
+        x = x[: len(x) - len(x) % 2].reshape(-1, 2)
+        if len(x):
+            peak = max(peak, float(np.abs(x).max()))
+        x = np.concatenate((carry, k_filter(x.astype(np.float64))))
+        n = len(x) - len(x) % SUB_BLOCK
+        if n:
+            # Moyenne quadratique par sous-bloc, somme des canaux (poids 1.0 pour G/D)
+            sub = x[:n].reshape(-1, SUB_BLOCK, 2)
+            powers.append(np.mean(sub * sub, axis=1).sum(axis=1))
+        carry = x[n:]
+
+    powers = np.concatenate(powers) if powers else np.empty(0)
+    return mtime, powers.astype(np.float32), peak
+
+
+def integrated_loudness(powers):
+    """Volume intégré (LUFS) à partir des puissances par sous-bloc, avec les deux portes."""
+    import numpy as np
+
+    powers = np.asarray(powers, dtype=np.float64)
+    if len(powers) < BLOCK_SUBS:
+        return None
+    # Blocs de 400 ms glissants par pas de 100 ms (somme cumulée : pas de boucle Python)
+    csum = np.concatenate(([0.0], np.cumsum(powers)))
+    blocks = (csum[BLOCK_SUBS:] - csum[:-BLOCK_SUBS]) / BLOCK_SUBS
+    with np.errstate(divide="ignore"):
+        levels = -0.691 + 10 * np.log10(blocks)
+
+    gated = blocks[levels > ABSOLUTE_GATE]
+    if not len(gated):
+        return None
+    threshold = -0.691 + 10 * math.log10(gated.mean()) + RELATIVE_GATE
+    gated = blocks[(levels > ABSOLUTE_GATE) & (levels > threshold)]
+    if not len(gated):
+        return None
+    return round(-0.691 + 10 * math.log10(gated.mean()), 2)
+
+
+def analyze_library(workers=None):
+    """Analyse les pistes nouvelles ou modifiées, par album (dossier) pour la valeur d'album."""
+    start_t = time.time()
+    try:
+        import scipy.signal  # noqa: F401 (pondération K)
+    except ImportError:
+        logger.error("Analyse de volume impossible : scipy n'est pas installé (pip install scipy)")
+        return {"ok": False, "error": "scipy requis pour l'analyse de volume"}
+    init_db()
+    conn = get_db()
+    rows = conn.execute("SELECT path, mtime FROM tracks").fetchall()
+
+    albums = {}
+    for r in rows:
+        albums.setdefault(os.path.dirname(r["path"]), []).append(r)
+
+    # Seul le mtime enregistré décide : une piste silencieuse ou en échec
+    # (loudness NULL) n'est pas réanalysée tant que le fichier ne change pas
+    todo, pending, mtimes = [], {}, {}
+    for folder, tracks in albums.items():
+        changed = False
+        for r in tracks:
+            try:
+                mtimes[r["path"]] = os.path.getmtime(music_file(r["path"]))
+            except OSError:
+                continue
+            if r["mtime"] != mtimes[r["path"]]:
+                changed = True
+        if changed:
+            # Une piste change -> tout l'album est réanalysé (valeur d'album cohérente)
+            paths = [r["path"] for r in tracks]
+            todo.extend(paths)
+            pending[folder] = {"paths": paths, "left": len(paths), "powers": [], "peak": 0.0}
+
+    logger.info(f"Volume : {len(todo)} pistes à analyser ({len(pending)} albums)")
+
+    analyzed = set()
+
+    def on_result(path, result):
+        analyzed.add(path)
+        mtime, powers, peak = result
+        conn.execute("UPDATE tracks SET mtime = ?, loudness = ?, peak = ? WHERE path = ?",
+                     (mtime, integrated_loudness(powers), round(peak, 6), path))
+        album = pending[os.path.dirname(path)]
+        album["powers"].append(powers)
+        album["peak"] = max(album["peak"], peak)
+        album["left"] -= 1
+        if album["left"] == 0:
+            _finish_album(conn, album)
+
+    result = run_batch(analyze_track, todo, workers=workers, on_result=on_result)
+
+    # Pistes en échec : mtime enregistré quand même, sans valeur, pour ne pas
+    # les redécoder (avec tout leur album) à chaque passe
+    failed = [p for p in todo if p not in analyzed]
+    conn.executemany("UPDATE tracks SET mtime = ?, loudness = NULL, peak = NULL WHERE path = ?",
+                     [(mtimes.get(p), p) for p in failed])
+
+    # Albums dont une piste a échoué : valeur calculée sur les pistes disponibles
+    for album in pending.values():
+        if album["left"] > 0 and album["powers"]:
+            _finish_album(conn, album)
+
+    conn.commit()
+    conn.close()
+    result.update(ok=True, albums=len(pending), time=round(time.time() - start_t, 2))
+    logger.info(f"✅ Analyse de volume terminée : {result}")
+    return result
+
+
+def _finish_album(conn, album):
+    import numpy as np
+
+    loudness = integrated_loudness(np.concatenate(album["powers"]))
+    peak = round(album["peak"], 6)
+    conn.executemany("UPDATE tracks SET album_loudness = ?, album_peak = ? WHERE path = ?",
+                     [(loudness, peak, p) for p in album["paths"]])
+    conn.commit()
+    album["powers"] = []  # Libère la mémoire au fil de l'eau
+
+
+def track_gain(path, conn=None):
+    """
+    Gain (dB) à appliquer à la lecture selon la config, sans aucune analyse :
+    0.0 si la normalisation est désactivée ou la piste pas encore analysée.
+    Le gain est limité pour que le pic ne dépasse pas 0 dBFS.
+    """
+    if not config_manager.get("playback", "volume_normalization"):
+        return 0.0
+    own = conn is None
+    if own:
+        conn = get_db()
+    try:
+        row = conn.execute(
+            "SELECT loudness, peak, album_loudness, album_peak FROM tracks WHERE path = ?", (path,)
+        ).fetchone()
+    except Exception:
+        row = None
+    finally:
+        if own:
+            conn.close()
+    if row is None:
+        return 0.0
+
+    album_mode = config_manager.get("playback", "normalization_mode") != "track"
+    loudness = row["album_loudness"] if album_mode and row["album_loudness"] is not None else row["loudness"]
+    peak = row["album_peak"] if album_mode and row["album_peak"] is not None else row["peak"]
+    if loudness is None:
+        return 0.0
+
+    target = float(config_manager.get("playback", "normalization_target") or -18)
+    gain = target - loudness
+    if peak:
+        gain = min(gain, -20 * math.log10(peak))
+    return round(gain, 2)
@@ -1,5 +1,4 @@
 import os
-import requests
 import platform
 
 # --- CONFIGURATION INTELLIGENTE ---
@@ -45,8 +44,11 @@ class MetadataManager:
             with open(filepath, 'r', encoding='utf-8') as f:
                 return f.read()
 
-        # Simulation simple si pas de réseau ou API
-        return f"Biographie simulée pour {artist_name}. (Mode Dev)"
+        # Pas encore sur disque : on demande au préchargement (non bloquant)
+        # et on renvoie un texte provisoire. Le prochain appel lira le fichier.
+        from src.core.prefetcher import prefetcher
+        prefetcher.request(artist_name)
+        return f"Biographie en cours de récupération pour {artist_name}..."
 
     def get_artist_image(self, artist_name):
         """Récupère la photo HD de l'artiste"""
@@ -55,4 +57,7 @@ class MetadataManager:
 
         if os.path.exists(filepath):
             return filepath
+
+        from src.core.prefetcher import prefetcher
+        prefetcher.request(artist_name)
         return None
@@ -0,0 +1,210 @@
+# src/core/metrics.py
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# --- MÉTRIQUES (format texte Prometheus) ---
+# Compteurs, jauges et histogrammes en mémoire, par processus, sans
+# dépendance : GET /metrics renvoie registry.render(). Ce qui vit ailleurs
+# (compteurs du lecteur persistant, autre processus) est lu au moment du
+# scrape via register_collector.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, doc, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, doc, labels=(), **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, doc, labels, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name, doc, labels=()):
+        return self._get(Counter, name, doc, labels)
+
+    def gauge(self, name, doc, labels=()):
+        return self._get(Gauge, name, doc, labels)
+
+    def histogram(self, name, doc, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, doc, labels, buckets=buckets)
+
+    def register_collector(self, fn):
+        """fn() -> itérable de (nom, type, aide, {labels}, valeur), appelé à chaque scrape."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        seen = set()
+        for fn in self._collectors:
+            for name, kind, doc, labels, value in fn():
+                if name not in seen:
+                    seen.add(name)
+                    lines += [f"# HELP {name} {doc}", f"# TYPE {name} {kind}"]
+                lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Instance globale
+registry = Registry()
+
+# Compteur générique des caches (vignettes, formes d'onde...) : hit / miss
+cache_requests = registry.counter(
+    "toune_cache_requests_total", "Consultations des caches disque", ("cache", "result"))
+
+
+def instrument_app(app):
+    """Chronomètre chaque requête Flask et ajoute la route GET /metrics."""
+    from flask import Response, g, request
+
+    latency = registry.histogram(
+        "toune_http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route"))
+    sizes = registry.histogram(
+        "toune_http_response_size_bytes", "Taille des réponses HTTP", ("route",), buckets=SIZE_BUCKETS)
+    responses = registry.counter(
+        "toune_http_responses_total", "Réponses HTTP par code", ("method", "route", "status"))
+    errors = registry.counter(
+        "toune_http_errors_total", "Exceptions non rattrapées", ("method", "route"))
+    in_flight = registry.gauge("toune_http_requests_in_flight", "Requêtes en cours")
+
+    def route():
+        # Le motif de la route (/api/content/sprite/<key>.jpg), jamais l'URL brute :
+        # le nombre de séries reste borné
+        return request.url_rule.rule if request.url_rule else "<aucune>"
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        in_flight.inc()
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            in_flight.dec()
+            labels = {"method": request.method, "route": route()}
+            latency.observe(time.perf_counter() - start, **labels)
+            responses.inc(status=response.status_code, **labels)
+            if response.content_length is not None:  # Flux (SSE, fichiers) : taille inconnue
+                sizes.observe(response.content_length, route=labels["route"])
+        return response
+
+    @app.teardown_request
+    def _record_error(exc):
+        if g.pop("metrics_start", None) is not None:  # after_request pas appelé
+            in_flight.dec()
+        if exc is not None:
+            errors.inc(method=request.method, route=route())
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,119 @@
+# src/core/microcache.py
+import functools
+import threading
+import time
+
+from src.core.metrics import registry
+
+# --- MICRO-CACHE DES LECTURES FRÉQUENTES ---
+# Plusieurs tablettes interrogent /api/status & co toutes les secondes : les
+# requêtes identiques arrivant en même temps partagent un seul calcul
+# (single-flight) et le résultat est resservi pendant ttl secondes.
+# La réponse est gardée sous forme brute (corps, code, en-têtes) et un objet
+# Response neuf est construit à chaque fois : after_request peut le modifier.
+requests_total = registry.counter(
+    "toune_microcache_requests_total", "Micro-cache des routes en lecture", ("route", "result"))
+
+# Attente max d'un calcul partagé : au-delà (MPD ou psutil bloqué), chaque
+# requête calcule sa propre réponse plutôt que d'immobiliser tous les threads
+COALESCE_TIMEOUT = 2.0
+
+_lock = threading.Lock()
+_entries = {}   # clé -> (expiration, (corps, code, en-têtes))
+_inflight = {}  # clé -> Event du calcul en cours
+
+
+def _ttl_for(endpoint, default):
+    """Surcharge par route dans la config (api.micro_cache_ttl), lue au premier appel."""
+    from src.core.config_manager import config_manager
+
+    overrides = config_manager.get("api", "micro_cache_ttl") or {}
+    return float(overrides.get(endpoint, default))
+
+
+def _snapshot(response):
+    return (response.get_data(), response.status_code,
+            [(k, v) for k, v in response.headers if k.lower() not in ("content-length", "x-cache")])
+
+
+def _rebuild(snapshot, result):
+    from flask import Response
+
+    body, status, headers = snapshot
+    resp = Response(body, status=status, headers=headers)
+    resp.headers["X-Cache"] = result.upper()
+    return resp
+
+
+def micro_cache(ttl=1.0):
+    """
+    Décorateur de vue Flask (GET) : clé = route + chaîne de requête.
+    Seules les réponses 200 non streamées sont gardées.
+    """
+    def decorator(view):
+        ttls = {}
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import make_response, request
+
+            endpoint = request.endpoint
+            if endpoint not in ttls:
+                ttls[endpoint] = _ttl_for(endpoint, ttl)
+            if request.method != "GET" or ttls[endpoint] <= 0:
+                return view(*args, **kwargs)
+
+            key = (endpoint, request.full_path)
+
+            def compute(result):
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    with _lock:
+                        _entries[key] = (time.monotonic() + ttls[endpoint], _snapshot(response))
+                requests_total.inc(route=endpoint, result=result)
+                response.headers["X-Cache"] = "MISS"
+                return response
+
+            while True:
+                with _lock:
+                    entry = _entries.get(key)
+                    if entry and entry[0] > time.monotonic():
+                        requests_total.inc(route=endpoint, result="hit")
+                        return _rebuild(entry[1], "hit")
+                    event = _inflight.get(key)
+                    if event is None:
+                        event = _inflight[key] = threading.Event()
+                        break
+                # Même requête déjà en cours : on attend son résultat plutôt que de refaire le calcul
+                if not event.wait(COALESCE_TIMEOUT):
+                    return compute("timeout")
+                with _lock:
+                    entry = _entries.get(key)
+                if entry and entry[0] > time.monotonic():
+                    requests_total.inc(route=endpoint, result="coalesced")
+                    return _rebuild(entry[1], "coalesced")
+                # Le calcul partagé a échoué ou n'était pas cachable : on retente
+
+            try:
+                return compute("miss")
+            finally:
+                with _lock:
+                    _inflight.pop(key, None)
+                    _prune()
+                event.set()
+
+        return wrapper
+    return decorator
+
+
+def _prune():
+    """À appeler verrou tenu : retire les entrées expirées (clés avec chaîne de requête variable)."""
+    if len(_entries) > 256:
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in _entries.items() if exp <= now]:
+            del _entries[key]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
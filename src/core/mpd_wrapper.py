@@ -1,10 +1,22 @@
 # Fichier: src/core/mpd_wrapper.py
 import logging
 import threading
+import time
 from mpd import MPDClient, ConnectionError, CommandError
+from src.core.metrics import registry
 
 logger = logging.getLogger("MPDWrapper")
 
+mpd_latency = registry.histogram("toune_mpd_command_seconds", "Durée des commandes MPD (attente du verrou incluse)", ("command",))
+mpd_failures = registry.counter("toune_mpd_command_failures_total", "Commandes MPD en échec", ("command",))
+
+def command_name(func):
+    """lambda c: c.lsinfo(path) -> 'lsinfo' (premier attribut appelé sur le client)."""
+    if func.__name__ != "<lambda>":
+        return func.__name__
+    names = func.__code__.co_names
+    return names[0] if names else "lambda"
+
 class MPDWrapper:
     def __init__(self, host="127.0.0.1", port=6600):
         self.host = host
@@ -37,6 +49,14 @@ class MPDWrapper:
 
     def exec(self, func, *args, **kwargs):
         """Exécute une commande de manière Thread-Safe."""
+        name = command_name(func)
+        start = time.perf_counter()
+        try:
+            return self._exec(name, func, *args, **kwargs)
+        finally:
+            mpd_latency.observe(time.perf_counter() - start, command=name)
+
+    def _exec(self, name, func, *args, **kwargs):
         with self._lock:  # <-- C'est ici que la magie opère
             self.ensure_connection()
             try:
@@ -49,12 +69,15 @@ class MPDWrapper:
                     return func(self._client, *args, **kwargs)
                 except Exception as e2:
                     logger.error(f"Echec final commande MPD: {e2}")
+                    mpd_failures.inc(command=name)
                     return None
             except CommandError as e:
                 logger.error(f"Erreur logique MPD (fichier introuvable ?): {e}")
+                mpd_failures.inc(command=name)
                 return None
             except Exception as e:
                 logger.error(f"Erreur inconnue MPD: {e}")
+                mpd_failures.inc(command=name)
                 return None
 
 # Instance globale
@@ -0,0 +1,230 @@
+# src/core/pcm_cache.py
+import hashlib
+import logging
+import os
+import threading
+import wave
+
+from src.core.config_manager import config_manager, parse_size
+from src.core.db import DATA_DIR
+from src.core.decoding import PcmFormat, WavStream
+
+logger = logging.getLogger("PcmCache")
+
+# --- CACHE DE PCM DÉCODÉ ---
+# Jingles, annonces, son de démarrage : des fichiers courts rejoués souvent.
+# Le PCM décodé est gardé en WAV dans data/cache/pcm et relu par mmap :
+# démarrage instantané, aucun ffmpeg. Seuls les vrais clips sont admis
+# (petit fichier, quelques secondes de PCM) et seulement à partir de leur
+# MIN_PLAYS-ième lecture : une chanson ordinaire ne passe jamais par ici.
+# Clé = chemin + taille + mtime (un stat, aucune lecture du fichier sur le
+# chemin de lecture).
+CACHE_DIR = os.path.join(DATA_DIR, "cache", "pcm")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CLIP_MAX_FILE_BYTES = 2 * 1024 * 1024    # Au-delà, ce n'est plus un "clip"
+CLIP_MAX_SECONDS = 30
+MIN_PLAYS = 2
+
+_lock = threading.Lock()
+_plays = {}     # clé -> lectures vues depuis le démarrage (avant admission)
+_too_long = set()  # Clés refusées (plus de CLIP_MAX_SECONDS) : plus jamais retentées
+_index = None   # clé -> {format: nom de fichier}
+stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+
+def max_bytes():
+    return parse_size(config_manager.get("playback", "pcm_cache_size"), DEFAULT_MAX_BYTES)
+
+
+def _key(path, st):
+    raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_name(key, fmt):
+    return f"{key}-{fmt.channels}-{fmt.rate}-{fmt.width}.wav"
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        _index = {}
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for name in os.listdir(CACHE_DIR):
+            try:
+                key, channels, rate, width = name[:-4].split("-")
+                fmt = PcmFormat(int(channels), int(rate), int(width))
+            except ValueError:
+                continue  # Fichier temporaire ou étranger
+            _index.setdefault(key, {})[fmt] = name
+    return _index
+
+
+def eligible(path):
+    """Clip court non WAV (un WAV PCM est déjà lu par mmap, sans décodage)."""
+    if max_bytes() <= 0 or os.path.splitext(path)[1].lower() == ".wav":
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if st.st_size <= CLIP_MAX_FILE_BYTES else None
+
+
+def lookup(path, fmt=None):
+    """Chemin du PCM en cache (format donné, ou n'importe lequel), None sinon."""
+    st = eligible(path)
+    if st is None:
+        return None
+    key = _key(path, st)
+    with _lock:
+        entries = _load_index().get(key, {})
+        name = entries.get(fmt) if fmt else next(iter(entries.values()), None)
+    if name is None:
+        stats["misses"] += 1
+        return None
+    filename = os.path.join(CACHE_DIR, name)
+    try:
+        os.utime(filename)  # LRU : la date de modification sert de dernier accès
+    except OSError:
+        with _lock:
+            entries.pop(fmt, None)
+        return None
+    stats["hits"] += 1
+    return filename
+
+
+def open_cached(path, start=0.0):
+    """Flux mmap sur le PCM en cache, None si absent."""
+    filename = lookup(path)
+    if filename is None:
+        return None
+    stream = WavStream(filename)
+    if start:
+        stream.seek(start)
+    return stream
+
+
+class CachingStream:
+    """
+    Enveloppe un flux de décodage : le PCM lu est écrit au passage dans un WAV
+    temporaire, publié dans le cache seulement si la piste a été lue en entier.
+    """
+
+    def __init__(self, stream, path, st):
+        self._stream = stream
+        self.format = stream.format
+        self._key = _key(path, st)
+        self._max_bytes = CLIP_MAX_SECONDS * self.format.rate * self.format.frame_bytes
+        self._tmp = os.path.join(CACHE_DIR, f".{self._key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self._wav = wave.open(self._tmp, "wb")
+        self._wav.setnchannels(self.format.channels)
+        self._wav.setsampwidth(self.format.width)
+        self._wav.setframerate(self.format.rate)
+        self._size = 0
+        self._complete = False
+
+    def read(self, frames):
+        data = self._stream.read(frames)
+        if self._wav is not None:
+            if not data:
+                self._complete = True
+            elif self._size + len(data) > self._max_bytes:
+                _too_long.add(self._key)
+                self._discard()  # Trop long pour un clip : on continue sans cache
+            else:
+                self._wav.writeframesraw(data)
+                self._size += len(data)
+        return data
+
+    def rewind(self):
+        self._discard()
+        self._stream.rewind()
+
+    def seek(self, seconds):
+        self._discard()
+        self._stream.seek(seconds)
+
+    def _discard(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+            os.unlink(self._tmp)
+
+    def close(self):
+        self._stream.close()
+        if self._wav is None:
+            return
+        if not self._complete:
+            self._discard()
+            return
+        self._wav.close()
+        self._wav = None
+        name = _entry_name(self._key, self.format)
+        os.replace(self._tmp, os.path.join(CACHE_DIR, name))
+        with _lock:
+            _load_index().setdefault(self._key, {})[self.format] = name
+        stats["stored"] += 1
+        prune()
+
+
+def prune(limit=None):
+    """Supprime les entrées les moins récemment lues au-delà de la taille maximale."""
+    limit = max_bytes() if limit is None else limit
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".wav"):
+            full = os.path.join(CACHE_DIR, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.unlink(os.path.join(CACHE_DIR, name))
+        except OSError:
+            continue
+        total -= size
+        stats["evicted"] += 1
+        with _lock:
+            for formats in _load_index().values():
+                for fmt, entry in list(formats.items()):
+                    if entry == name:
+                        del formats[fmt]
+
+
+def open_stream(path, start=0.0):
+    """
+    Comme decoding.open_stream, en passant par le cache pour les clips courts :
+    hit -> mmap du PCM ; miss -> décodage normal, mis en cache au passage
+    à partir de la MIN_PLAYS-ième lecture.
+    """
+    from src.core import decoding
+
+    stream = open_cached(path, start)
+    if stream is not None:
+        return stream
+    stream = decoding.open_stream(path, start)
+    st = eligible(path)
+    if start or st is None or isinstance(stream, WavStream):
+        return stream
+    key = _key(path, st)
+    with _lock:
+        if key in _too_long:
+            return stream
+        if len(_plays) > 4096:
+            _plays.clear()
+        _plays[key] = _plays.get(key, 0) + 1
+        if _plays[key] < MIN_PLAYS:
+            return stream  # Première lecture : pas encore un clip "rejoué souvent"
+        del _plays[key]
+    try:
+        return CachingStream(stream, path, st)
+    except OSError as e:
+        logger.warning(f"Cache PCM indisponible : {e}")
+        return stream
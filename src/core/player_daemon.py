@@ -0,0 +1,265 @@
+# src/core/player_daemon.py
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+from collections import deque
+
+from src.core import pcm_cache
+from src.core.analysis import LevelTap
+from src.core.audio_engine import AudioEngine
+
+logger = logging.getLogger("PlayerDaemon")
+
+# --- LECTEUR PERSISTANT ---
+# Un seul processus garde le moteur (et le device) ouvert ; les commandes
+# arrivent sur une socket Unix, une requête JSON par ligne :
+#   {"cmd": "play", "files": [...]}  ->  {"ok": true, ...}
+# Exception : {"cmd": "levels"} garde la connexion ouverte et y diffuse les
+# niveaux (une ligne JSON par image) jusqu'à ce que le client se déconnecte.
+COMMANDS = ("play", "enqueue", "pause", "resume", "seek", "volume", "stop", "status", "quit", "levels")
+
+
+class PlayerDaemon:
+    def __init__(self, device="default", engine=None, outputs=None, sink=None):
+        self.engine = engine or AudioEngine(device=device, outputs=outputs or None, sink=sink)
+        self.tap = self.engine.tap = LevelTap()
+        self.queue = deque()
+        self.loop = False
+        self._loop_files = []     # Pistes rejouées quand la file se vide (boucle)
+        self.state = "stopped"
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._run_files = []      # Pistes remises au moteur pour la lecture en cours
+        self._index = -1          # Index (dans _run_files) de la piste audible
+        self._dropped = 0         # Pistes déjà jouées retirées de _run_files
+        self._offset = 0.0        # Position de départ de la piste audible (seek)
+        self._start = 0.0         # Position de départ demandée pour la prochaine lecture
+        self._gen = 0             # Incrémenté à chaque interruption : périme la lecture en cours
+        self._thread = threading.Thread(target=self._player, name="player", daemon=True)
+        self._thread.start()
+
+    # --- Boucle de lecture ---
+    def _refill(self):
+        """À appeler verrou tenu : en boucle, la file vide repart du début de la liste."""
+        if not self.queue and self.loop:
+            self.queue.extend(self._loop_files)
+
+    def _next_tracks(self, gen):
+        """
+        Consommé par le thread de décodage : la file peut grossir pendant la
+        lecture. La boucle est servie ici, au fil du décodage : la lecture ne
+        s'arrête pas entre deux passages (device ouvert, pas de blanc).
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if gen != self._gen or not self.queue:
+                    return
+                filename = self.queue.popleft()
+                self._run_files.append(filename)
+            yield filename
+
+    def _replay(self, filename):
+        """La piste suivante est-elle la même (boucle d'un fichier, --repeat) ? Le moteur la rejoue de mémoire."""
+        with self._lock:
+            upcoming = self.queue[0] if self.queue else (self._loop_files[0] if self.loop and self._loop_files else None)
+            return upcoming == filename
+
+    def _on_track(self, index, filename):
+        with self._lock:
+            if index > 0 or self._index >= 0:
+                self._offset = 0.0
+            # Pistes jouées oubliées : en boucle, une lecture peut durer indéfiniment
+            del self._run_files[: index - self._dropped]
+            self._dropped, self._index = index, 0
+
+    def _player(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while True:
+                with self._lock:
+                    self._refill()
+                    if not self.queue:
+                        self.state = "stopped"
+                        break
+                    self._run_files, self._index, self._dropped = [], -1, 0
+                    self._offset, start, self._start = self._start, self._start, 0.0
+                    self.state = "paused" if self.engine.paused else "playing"
+                    tracks = self._next_tracks(self._gen)
+                try:
+                    self.engine.play_playlist(tracks, on_track=self._on_track, start=start, replay=self._replay)
+                except Exception as e:
+                    logger.error(f"Erreur de lecture : {e}")
+                    self.engine.close()
+            # Sorties fermées seulement à l'arrêt : entre deux lectures (seek,
+            # play pendant la lecture) le device reste ouvert s'il a le même format
+            self.engine.close()
+
+    def _interrupt(self, keep_current=False):
+        """
+        À appeler verrou tenu : périme la lecture en cours et renvoie les pistes
+        déjà prises par le décodeur mais pas encore jouées (courante incluse si keep_current).
+        """
+        self._gen += 1
+        pending = []
+        if self.state != "stopped":
+            first = self._index if keep_current else self._index + 1
+            pending = self._run_files[max(first, 0):]
+        self._run_files, self._index, self._dropped = [], -1, 0
+        return pending
+
+    # --- Commandes ---
+    def play(self, files, loop=False):
+        with self._lock:
+            self._interrupt()
+            self.queue = deque(files)
+            self.loop = loop
+            self._loop_files = list(files) if loop else []
+            self._start = 0.0
+        self.engine.stop()
+        self._wake.set()
+        return {"queued": len(files)}
+
+    def enqueue(self, files):
+        with self._lock:
+            self.queue.extend(files)
+            if self.loop:
+                self._loop_files.extend(files)
+        self._wake.set()
+        return {"queued": len(self.queue)}
+
+    def pause(self, on=None):
+        if on is None:
+            on = not self.engine.paused
+        if on:
+            self.engine.pause()
+        else:
+            self.engine.resume()
+        with self._lock:
+            if self.state != "stopped":
+                self.state = "paused" if on else "playing"
+        return {"paused": on}
+
+    def resume(self):
+        return self.pause(False)
+
+    def seek(self, position):
+        """Repart de position (secondes) dans la piste en cours ; les suivantes sont conservées."""
+        with self._lock:
+            if self.state == "stopped" or self._index < 0:
+                return {"error": "Rien en lecture"}
+            self.queue.extendleft(reversed(self._interrupt(keep_current=True)))
+            self._start = max(float(position), 0.0)
+        self.engine.stop()
+        self._wake.set()
+        return {"position": self._start}
+
+    def volume(self, level=None):
+        """Volume logiciel 0-100 (100 = gain unité) ; sans argument, renvoie le volume courant."""
+        if level is not None:
+            self.engine.set_volume(min(max(int(level), 0), 100))
+        return {"volume": self.engine.gain.volume}
+
+    def stop(self):
+        with self._lock:
+            self._interrupt()
+            self.queue.clear()
+            self.loop = False
+            self._loop_files = []
+        self.engine.stop()
+        return {}
+
+    def status(self):
+        engine = self.engine
+        with self._lock:
+            tag, fmt = engine.now_playing, engine.format
+            upcoming = self._run_files[self._index + 1:] + list(self.queue)
+            result = {
+                "state": self.state,
+                "file": tag[1] if tag else None,
+                "position": round(self._offset + engine.position / fmt.rate, 2) if tag and fmt else 0.0,
+                "format": str(fmt) if tag and fmt else None,
+                "loop": self.loop,
+                "volume": engine.gain.volume,
+                "queue": upcoming,
+            }
+        result["buffer"] = engine.buffer_stats()
+        result["pcm_cache"] = dict(pcm_cache.stats)
+        result["levels"] = dict(self.tap.stats)
+        return result
+
+    def handle(self, request):
+        cmd = request.get("cmd")
+        if cmd not in COMMANDS:
+            return {"ok": False, "error": f"Commande inconnue : {cmd}"}
+        if cmd == "quit":
+            return {"ok": True}
+        if cmd in ("play", "enqueue"):
+            files = [os.path.abspath(f) for f in request.get("files") or []]
+            result = self.play(files, bool(request.get("loop"))) if cmd == "play" else self.enqueue(files)
+        elif cmd == "seek":
+            result = self.seek(request.get("position", 0))
+        elif cmd == "pause":
+            result = self.pause(request.get("on"))
+        elif cmd == "volume":
+            result = self.volume(request.get("volume"))
+        else:
+            result = getattr(self, cmd)()
+        return dict(result, ok="error" not in result)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line or b"{}")
+            if request.get("cmd") == "levels":
+                return self._stream_levels()
+            response = self.server.player.handle(request)
+        except Exception as e:
+            request, response = {}, {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        if request.get("cmd") == "quit":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def _stream_levels(self):
+        tap = self.server.player.tap
+        q = tap.subscribe()
+        try:
+            while True:
+                try:
+                    frame = q.get(timeout=1.0)
+                except queue.Empty:
+                    frame = {}  # Silence / pause : ligne vide pour détecter un client parti
+                self.wfile.write(json.dumps(frame).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except OSError:
+            pass  # Client déconnecté
+        finally:
+            tap.unsubscribe(q)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(sock_path, device="default", outputs=None, sink=None):
+    """Bloque jusqu'à la commande quit. outputs / sink : comme pour AudioEngine."""
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)  # Socket orpheline d'un précédent démon
+    player = PlayerDaemon(device=device, outputs=outputs, sink=sink)
+    server = _Server(sock_path, _Handler)
+    server.player = player
+    logger.info(f"Lecteur à l'écoute sur {sock_path}")
+    try:
+        server.serve_forever()
+    finally:
+        player.stop()
+        player.engine.shutdown()
+        server.server_close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
@@ -0,0 +1,201 @@
+# src/core/prefetcher.py
+import logging
+import os
+import queue
+import threading
+import time
+
+from src.core import metadata
+from src.core.config_manager import config_manager
+from src.core.db import get_db
+
+logger = logging.getLogger("Prefetcher")
+
+
+# --- FOURNISSEURS (PLUGGABLES) ---
+class MetadataProvider:
+    """Interface d'un fournisseur de métadonnées. Renvoie None si rien trouvé."""
+    name = "base"
+
+    def fetch_bio(self, artist_name):
+        return None
+
+    def fetch_image(self, artist_name):
+        """Renvoie les octets JPEG de la photo d'artiste."""
+        return None
+
+
+class StubProvider(MetadataProvider):
+    """
+    Fournisseur local sans réseau, pour les tests uniquement (provider: "stub") :
+    ses bios factices sont écrites sur le NAS et ne seraient jamais remplacées.
+    """
+    name = "stub"
+
+    def fetch_bio(self, artist_name):
+        return f"Biographie de {artist_name} (fournisseur local)."
+
+
+PROVIDERS = {"stub": StubProvider}
+
+
+def register_provider(name, provider_cls):
+    """Permet à un plugin d'ajouter son fournisseur (ex: 'lastfm')."""
+    PROVIDERS[name] = provider_cls
+
+
+# --- LIMITEUR DE DÉBIT ---
+class RateLimiter:
+    """Seau à jetons : au plus `rate` appels par seconde, partagé entre les workers."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = max(float(rate), 0.01)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# --- PRÉCHARGEMENT EN TÂCHE DE FOND ---
+class MetadataPrefetcher:
+    def __init__(self, provider=None, workers=None, rate=None):
+        self.provider = provider
+        self.workers = workers
+        self.rate = rate
+        self._queue = queue.Queue()
+        self._seen = set()  # Artistes déjà demandés (en attente ou traités)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._limiter = None
+        self.stats = {"queued": 0, "fetched": 0, "skipped": 0, "errors": 0}
+
+    def enabled(self):
+        """Fournisseur configuré et plugin actif ; sans fournisseur, rien n'est demandé."""
+        if not config_manager.get("plugins", "metadata_fetcher"):
+            return False
+        if self.provider is None:
+            name = config_manager.get("metadata", "provider")
+            if not name:
+                return False
+            if name not in PROVIDERS:
+                logger.warning(f"Fournisseur de métadonnées inconnu : {name}")
+                return False
+            self.provider = PROVIDERS[name]()
+        return True
+
+    def _start(self):
+        """Démarre les workers au premier besoin (rien ne tourne à l'import)."""
+        if self._threads:
+            return
+        workers = self.workers or config_manager.get("metadata", "workers") or 2
+        rate = self.rate or config_manager.get("metadata", "rate_limit") or 1.0
+        self._limiter = RateLimiter(rate)
+        for i in range(int(workers)):
+            t = threading.Thread(target=self._worker, name=f"prefetch-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"Préchargement démarré ({self.provider.name}, {workers} workers, {rate}/s)")
+
+    def request(self, artist_name):
+        """Demande non bloquante. Renvoie False si déjà demandé ou invalide."""
+        if not artist_name or os.sep in artist_name or artist_name == "Unknown":
+            return False
+        key = artist_name.strip().lower()
+        with self._lock:
+            if key in self._seen or not self.enabled():
+                return False
+            self._seen.add(key)
+            self._start()
+            self.stats["queued"] += 1
+        self._queue.put(artist_name)
+        return True
+
+    def prefetch_library(self):
+        """
+        Parcourt les artistes de la bibliothèque dans un thread (ne bloque pas
+        l'appelant). Renvoie False si aucun fournisseur n'est configuré.
+        """
+        if not self.enabled():
+            return False
+
+        def walk():
+            conn = get_db()
+            try:
+                rows = conn.execute("SELECT DISTINCT artist FROM tracks ORDER BY artist").fetchall()
+            except Exception as e:
+                logger.error(f"Lecture des artistes impossible: {e}")
+                return
+            finally:
+                conn.close()
+            count = sum(1 for r in rows if self.request(r["artist"]))
+            logger.info(f"{count} artistes ajoutés au préchargement")
+
+        threading.Thread(target=walk, name="prefetch-walk", daemon=True).start()
+        return True
+
+    def status(self):
+        return dict(self.stats, pending=self._queue.qsize(),
+                    provider=self.provider.name if self.provider else None)
+
+    def _worker(self):
+        while True:
+            artist_name = self._queue.get()
+            try:
+                self._fetch(artist_name)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Échec préchargement {artist_name}: {e}")
+                # Oublié : une prochaine demande pourra réessayer
+                with self._lock:
+                    self._seen.discard(artist_name.strip().lower())
+            finally:
+                self._queue.task_done()
+
+    def _fetch(self, artist_name):
+        bio_path = os.path.join(metadata.FOLDERS["bios"], f"{artist_name}.txt")
+        img_path = os.path.join(metadata.FOLDERS["artist_imgs"], f"{artist_name}.jpg")
+        need_bio = not os.path.exists(bio_path)
+        need_img = not os.path.exists(img_path)
+        if not (need_bio or need_img):
+            self.stats["skipped"] += 1
+            return
+
+        if need_bio:
+            self._limiter.acquire()
+            bio = self.provider.fetch_bio(artist_name)
+            if bio:
+                _atomic_write(bio_path, bio.encode("utf-8"))
+                # Cherchable tout de suite, sans attendre la prochaine synchro
+                from src.core.docs_index import index_file
+                index_file("bio", bio_path)
+        if need_img:
+            self._limiter.acquire()
+            img = self.provider.fetch_image(artist_name)
+            if img:
+                _atomic_write(img_path, img)
+        self.stats["fetched"] += 1
+
+
+def _atomic_write(path, data):
+    """Écrit via un fichier temporaire : un lecteur ne voit jamais un fichier à moitié écrit."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.part"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# Instance globale
+prefetcher = MetadataPrefetcher()
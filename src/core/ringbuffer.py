@@ -0,0 +1,117 @@
+# src/core/ringbuffer.py
+import threading
+from collections import deque
+
+
+class RingBuffer:
+    """
+    Tampon circulaire d'octets partagé entre un producteur (décodage) et un
+    consommateur (sortie audio). Le producteur marque le début de chaque
+    segment (piste) avec son format : le consommateur ne lit jamais à cheval
+    sur deux segments et sait quand le format change.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self._buf = bytearray(self.capacity)
+        self._written = 0  # Positions absolues (jamais remises à zéro)
+        self._read = 0
+        self._marks = deque()  # (position, format, étiquette)
+        self._pads = deque()   # (position, taille) : fin de tampon sautée
+        self._current = (None, None)
+        self._cond = threading.Condition()
+        self._view = memoryview(self._buf)
+        self._lent = 0          # Octets prêtés au consommateur (libérés au read suivant)
+        self._closed = False    # Le producteur a terminé
+        self._aborted = False   # Arrêt immédiat demandé
+
+    # --- Producteur ---
+    def start_segment(self, fmt, tag=None):
+        with self._cond:
+            self._marks.append((self._written, fmt, tag))
+
+    def write(self, data):
+        """Écrit un bloc entier (bloquant tant qu'il n'y a pas la place). False si arrêté."""
+        n = len(data)
+        if n > self.capacity // 2:
+            raise ValueError("Bloc trop grand pour le tampon")
+        with self._cond:
+            # Un bloc est toujours contigu (jamais coupé par la fin du tampon) :
+            # le consommateur peut ainsi lire des trames entières sans copie.
+            pos = self._written % self.capacity
+            pad = self.capacity - pos if n > self.capacity - pos else 0
+            while self.capacity - (self._written - self._read) < n + pad and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                return False
+            if pad:
+                self._pads.append((self._written, pad))
+                self._written += pad
+                pos = 0
+            self._buf[pos:pos + n] = data
+            self._written += n
+            self._cond.notify_all()
+        return True
+
+    def close(self):
+        """Fin des données : le consommateur videra ce qui reste."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # --- Consommateur ---
+    def read(self, max_frames):
+        """
+        Renvoie (format, étiquette, vue) pour au plus max_frames trames du
+        segment courant. Octets vides = fin (producteur terminé ou arrêt).
+        La vue pointe directement dans le tampon (aucune copie) : elle reste
+        valable jusqu'au read() suivant, qui rend la place au producteur.
+        """
+        with self._cond:
+            if self._lent:
+                self._read += self._lent
+                self._lent = 0
+                self._cond.notify_all()
+            while self._written == self._read and not (self._closed or self._aborted):
+                self._cond.wait()
+            if self._aborted or self._written == self._read:
+                return None, None, b""
+            if self._pads and self._pads[0][0] == self._read:
+                self._read += self._pads.popleft()[1]
+                self._cond.notify_all()
+
+            while self._marks and self._marks[0][0] <= self._read:
+                _, fmt, tag = self._marks.popleft()
+                self._current = (fmt, tag)
+            fmt, tag = self._current
+
+            limit = self._written - self._read
+            if self._marks:
+                limit = min(limit, self._marks[0][0] - self._read)
+            if self._pads:
+                limit = min(limit, self._pads[0][0] - self._read)
+            pos = self._read % self.capacity
+            n = min(max_frames * fmt.frame_bytes, limit, self.capacity - pos)
+            self._lent = n
+            return fmt, tag, self._view[pos:pos + n]
+
+    def abort(self):
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+    def wait_available(self, nbytes):
+        """Attend que nbytes soient disponibles (ou la fin des données). Sert au pré-remplissage."""
+        with self._cond:
+            while (self._written - self._read - self._lent < nbytes
+                   and not (self._closed or self._aborted)):
+                self._cond.wait()
+
+    @property
+    def available(self):
+        """Octets prêts à être lus (hors tranche en cours de lecture)."""
+        return self._written - self._read - self._lent
+
+    @property
+    def closed(self):
+        return self._closed
@@ -3,9 +3,15 @@ import logging
 import os
 from src.core.mpd_wrapper import mpd_wrapper
 from src.core.db import get_db, init_db
+from src.core.metrics import registry
 
 logger = logging.getLogger("Scanner")
 
+scan_tracks = registry.counter("toune_scan_tracks_total", "Titres traités par les scans de la bibliothèque")
+scan_seconds = registry.histogram("toune_scan_duration_seconds", "Durée des scans de la bibliothèque",
+                                  buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800))
+scan_rate = registry.gauge("toune_scan_tracks_per_second", "Débit du dernier scan")
+
 def fetch_files_recursive(path=""):
     """Récupère les fichiers dossier par dossier pour éviter le timeout."""
     results = []
@@ -76,10 +82,23 @@ def scan_library():
     c = conn.cursor()
     
     try:
-        c.execute("DELETE FROM tracks")
-        c.executemany("INSERT INTO tracks (path, title, artist, album, genre, duration, year) VALUES (?, ?, ?, ?, ?, ?, ?)", tracks)
+        # Mise à jour en place (et non DELETE + INSERT) pour conserver les
+        # analyses déjà faites (volume, mtime) des pistes inchangées
+        c.executemany(
+            "INSERT INTO tracks (path, title, artist, album, genre, duration, year) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET title=excluded.title, artist=excluded.artist, album=excluded.album, "
+            "genre=excluded.genre, duration=excluded.duration, year=excluded.year",
+            tracks
+        )
+        c.execute("CREATE TEMP TABLE scan_paths (path TEXT PRIMARY KEY)")
+        c.executemany("INSERT OR IGNORE INTO scan_paths (path) VALUES (?)", [(t[0],) for t in tracks])
+        c.execute("DELETE FROM tracks WHERE path NOT IN (SELECT path FROM scan_paths)")
+        c.execute("DROP TABLE scan_paths")
         conn.commit()
         duration = time.time() - start_t
+        scan_tracks.inc(len(tracks))
+        scan_seconds.observe(duration)
+        scan_rate.set(round(len(tracks) / duration, 1) if duration else 0)
         logger.info(f"✅ Scan terminé : {len(tracks)} titres en {duration:.2f}s")
         return {"ok": True, "count": len(tracks), "time": duration}
         
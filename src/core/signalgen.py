@@ -0,0 +1,106 @@
+# src/core/signalgen.py
+import wave
+
+import numpy as np
+
+from src.core.dsp import pack_samples
+
+# --- GÉNÉRATEUR DE SIGNAUX DE TEST ---
+# Tout est calculé par blocs NumPy à partir de l'index absolu de l'échantillon :
+# la phase est continue d'un bloc (et d'un fichier) à l'autre, la mémoire est
+# constante quelle que soit la durée. Le bruit rose, lui, transmet l'état de
+# son filtre (scipy requis).
+BLOCK_FRAMES = 65536
+SIGNALS = ("sine", "sweep", "multitone", "pink", "white", "gaps", "silence")
+PEAKS = {2: 32767, 3: 8388607, 4: 2147483647}
+# Filtre « pinking » de J. O. Smith (b, a) et son gain RMS (norme de la réponse
+# impulsionnelle) ; l'entrée est uniforme dans [-1, 1] (variance 1/3) : RMS de sortie 0.2
+PINK_B = [0.049922035, -0.095993537, 0.050612699, -0.004408786]
+PINK_A = [1.0, -2.494956002, 2.017265875, -0.522189400]
+PINK_SCALE = 0.2 / (0.08619 / np.sqrt(3.0))
+
+
+def _sine(n, rate, freq):
+    return np.sin(2 * np.pi * freq * (n / rate))
+
+
+def _sweep(n, rate, f0, f1, seconds):
+    """Balayage logarithmique f0 -> f1 sur toute la durée."""
+    k = np.log(f1 / f0)
+    t = n / rate
+    return np.sin(2 * np.pi * f0 * seconds / k * (np.exp(t / seconds * k) - 1))
+
+
+def _pink(rng, frames, channels, state):
+    """
+    Bruit rose (1/f) : bruit blanc uniforme passé dans un filtre IIR à 3 pôles
+    et 3 zéros (pente de -3 dB/octave). L'état du filtre est gardé
+    dans state d'un bloc, et d'un fichier, à l'autre : pas de saut, échelle fixe.
+    """
+    from scipy.signal import lfilter
+
+    zi = state.get("pink")
+    if zi is None or zi.shape[1] != channels:
+        zi = np.zeros((len(PINK_A) - 1, channels))
+    x, state["pink"] = lfilter(PINK_B, PINK_A, rng.uniform(-1, 1, (frames, channels)), axis=0, zi=zi)
+    x *= PINK_SCALE
+    return np.clip(x, -1.0, 1.0, out=x)
+
+
+def generate(kind="sine", rate=44100, seconds=3.0, channels=1, freq=440.0,
+             f_end=20000.0, tones=(100.0, 1000.0, 5000.0), gap=0.5, seed=0,
+             start=0, total=None, state=None):
+    """
+    Itère sur des blocs float64 (trames, canaux) dans [-1, 1].
+    start / total : position et durée globales (en trames) quand un signal
+    continu est découpé en plusieurs fichiers (test gapless).
+    state : dict partagé entre ces fichiers pour les signaux à mémoire (pink).
+    """
+    frames = int(rate * seconds)
+    total = total or frames
+    if kind == "gaps" and int(rate * gap) < 1:
+        raise ValueError(f"gap trop court : {gap} s (au moins une trame à {rate} Hz)")
+    rng = np.random.default_rng(seed + start)
+    state = {} if state is None else state
+    for pos in range(0, frames, BLOCK_FRAMES):
+        count = min(BLOCK_FRAMES, frames - pos)
+        n = np.arange(start + pos, start + pos + count, dtype=np.float64)
+        if kind == "sine":
+            x = _sine(n, rate, freq)
+        elif kind == "sweep":
+            x = _sweep(n, rate, freq, f_end, total / rate)
+        elif kind == "multitone":
+            x = sum(_sine(n, rate, f) for f in tones) / len(tones)
+        elif kind == "gaps":
+            # Alternance son / silence de gap secondes : vérifie qu'aucun blanc n'est ajouté ni mangé
+            on = (n // int(rate * gap)) % 2 == 0
+            x = _sine(n, rate, freq) * on
+        elif kind == "white":
+            yield rng.uniform(-1, 1, (count, channels))
+            continue
+        elif kind == "pink":
+            yield _pink(rng, count, channels, state)
+            continue
+        elif kind == "silence":
+            x = np.zeros(count)
+        else:
+            raise ValueError(f"Signal inconnu : {kind}")
+        yield np.repeat(x[:, None], channels, axis=1)
+
+
+def write_wav(path, blocks, rate, channels, bits=16, level_db=-6.0):
+    """Quantifie et écrit les blocs au fil de l'eau. Renvoie le nombre de trames."""
+    width = bits // 8
+    if width not in PEAKS:
+        raise ValueError(f"Résolution non supportée : {bits} bits")
+    scale = PEAKS[width] * 10 ** (level_db / 20)
+    frames = 0
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        for x in blocks:
+            q = np.rint(x * scale).astype(np.int64 if width == 4 else np.int32)
+            w.writeframesraw(pack_samples(q.ravel(), width))
+            frames += len(x)
+    return frames
@@ -0,0 +1,331 @@
+# src/core/sinks.py
+import errno
+import logging
+import os
+import stat
+import threading
+import time
+import wave
+from collections import deque
+
+logger = logging.getLogger("Sinks")
+
+
+def alsa_formats():
+    """
+    Largeur d'échantillon (octets) -> format ALSA.
+    3 octets = 24 bits "packed" (S24_3LE), tel que sorti par wave / ffmpeg.
+    Import tardif : les sorties fichier / null fonctionnent sans pyalsaaudio.
+    """
+    import alsaaudio
+
+    return {
+        1: alsaaudio.PCM_FORMAT_U8,
+        2: alsaaudio.PCM_FORMAT_S16_LE,
+        3: alsaaudio.PCM_FORMAT_S24_3LE,
+        4: alsaaudio.PCM_FORMAT_S32_LE,
+    }
+
+
+class AlsaSink:
+    """
+    Sortie ALSA. Le PCM reste ouvert tant que le format ne change pas (pas de trou).
+    native : d'après le profil de la carte (device_profiles), ouvre hw: directement
+    dans un format qu'elle accepte plutôt que de laisser plughw convertir.
+    """
+
+    def __init__(self, device="default", periodsize=1024, native=False):
+        self.device = device
+        self.periodsize = periodsize
+        self.native = native
+        self.pcm = None
+        self._params = None   # Paramètres réellement ouverts
+        self._planned = None  # Paramètres demandés (différents après un repli)
+        self._refused = set() # Paramètres natifs refusés : repli direct ensuite
+        self._widen = None
+
+    def open(self, fmt):
+        import alsaaudio
+
+        formats = alsa_formats()
+        if fmt.width not in formats:
+            raise ValueError(f"Unsupported sample width: {fmt.width}")
+        device, width, periodsize = self.device, fmt.width, self.periodsize
+        if self.native:
+            from src.core.device_profiles import plan_output
+            device, width, periodsize = plan_output(self.device, fmt)
+        params = (device, fmt.channels, fmt.rate, formats[width], periodsize)
+        # Comparé au plan et non à _params : après un repli, le même format
+        # garde le PCM ouvert (gapless) au lieu de le rouvrir à chaque piste
+        if self.pcm is not None and self._planned == params:
+            return
+        self.close()
+        fallback = (self.device, fmt.channels, fmt.rate, formats[fmt.width], self.periodsize)
+        if params in self._refused:
+            width = fmt.width
+            self._open(fallback)
+        else:
+            try:
+                self._open(params)
+            except alsaaudio.ALSAAudioError as e:
+                if device == self.device:
+                    raise
+                # hw: occupé ou refusé : on retombe sur le device configuré
+                logger.warning(f"Sortie native {device} refusée ({e}), repli sur {self.device}")
+                self._refused.add(params)
+                width = fmt.width
+                self._open(fallback)
+        self._planned = params
+        self._widen = (fmt.width, width) if width != fmt.width else None
+        if self._params[0] != self.device:
+            logger.info(f"Sortie native {device} ({width * 8} bits, période {periodsize})")
+
+    def _open(self, params):
+        import alsaaudio
+
+        device, channels, rate, alsa_format, periodsize = params
+        # Ouverture ALSA sans utiliser les set* dépréciés
+        self.pcm = alsaaudio.PCM(
+            type=alsaaudio.PCM_PLAYBACK,
+            mode=alsaaudio.PCM_NORMAL,
+            device=device,
+            channels=channels,
+            rate=rate,
+            format=alsa_format,
+            periodsize=periodsize,
+        )
+        self._params = params
+
+    def write(self, data):
+        """Bloquant (cadencé par la carte). Renvoie le nombre de trames écrites."""
+        if self._widen:
+            from src.core.dsp import widen
+            data = widen(data, *self._widen)
+        return self.pcm.write(data)
+
+    def close(self):
+        if self.pcm is not None:
+            self.pcm.close()
+            self.pcm = None
+            self._params = self._planned = None
+            self._widen = None
+
+    def __str__(self):
+        return f"alsa:{self.device}"
+
+
+class NullSink:
+    """Jette le PCM aussi vite qu'il arrive : mesure du moteur sans DAC."""
+
+    def __init__(self):
+        self.frames = 0
+        self._frame_bytes = 1
+
+    def open(self, fmt):
+        self._frame_bytes = fmt.frame_bytes
+
+    def write(self, data):
+        frames = len(data) // self._frame_bytes
+        self.frames += frames
+        return frames
+
+    def close(self):
+        pass
+
+    def __str__(self):
+        return "null"
+
+
+class WavFileSink:
+    """
+    Enregistre la sortie dans un WAV (ce que le DAC aurait reçu, gain compris).
+    Le format est celui de la première piste ; une piste d'un autre format est
+    ignorée (ses blocs ne sont pas écrits).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = None
+        self._current = None  # Format de la piste en cours
+        self._wav = None
+
+    def open(self, fmt):
+        self._current = fmt
+        if self._wav is not None:
+            if fmt != self.format:
+                logger.warning(f"{self} : format {fmt} ignoré (fichier en {self.format})")
+            return
+        self.format = fmt
+        self._wav = wave.open(self.path, "wb")
+        self._wav.setnchannels(fmt.channels)
+        self._wav.setsampwidth(fmt.width)
+        self._wav.setframerate(fmt.rate)
+
+    def write(self, data):
+        if self._wav is None or self._current != self.format:
+            return 0
+        self._wav.writeframesraw(data)
+        return len(data) // self.format.frame_bytes
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()  # Réécrit les tailles dans l'en-tête
+            self._wav = None
+
+    def __str__(self):
+        return f"wav:{self.path}"
+
+
+class TimedSink:
+    """Enveloppe une sortie et mesure la durée de chaque écriture (benchmark)."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.timings = []
+
+    def open(self, fmt):
+        self.sink.open(fmt)
+
+    def write(self, data):
+        start = time.perf_counter()
+        written = self.sink.write(data)
+        self.timings.append(time.perf_counter() - start)
+        return written
+
+    def close(self):
+        self.sink.close()
+
+    def __str__(self):
+        return str(self.sink)
+
+
+class FileSink:
+    """
+    PCM brut (format natif) vers un fichier ou une FIFO, p. ex. /tmp/snapfifo
+    pour snapserver (dont le sampleformat doit correspondre à la source).
+    Une FIFO sans lecteur est ignorée jusqu'au prochain changement de piste.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def open(self, fmt):
+        if self._fd is not None:
+            return
+        try:
+            if os.path.exists(self.path) and stat.S_ISFIFO(os.stat(self.path).st_mode):
+                # Non bloquant à l'ouverture (ENXIO si personne n'écoute), bloquant ensuite
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+                os.set_blocking(self._fd, True)
+            else:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError as e:
+            if e.errno != errno.ENXIO:
+                logger.warning(f"Sortie {self} indisponible : {e}")
+            self._fd = None
+
+    def write(self, data):
+        if self._fd is None:
+            return 0
+        try:
+            os.write(self._fd, data)
+        except OSError as e:
+            # Lecteur de la FIFO parti (EPIPE) : on réessaiera à la prochaine piste
+            logger.warning(f"Sortie {self} fermée : {e}")
+            self.close()
+        return 0
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __str__(self):
+        return f"file:{self.path}"
+
+
+class QueuedSink:
+    """
+    Sortie secondaire alimentée par son propre thread et une file bornée :
+    si elle ne suit pas, ses blocs sont perdus (comptés dans dropped) mais
+    la sortie principale et les autres sorties ne sont jamais bloquées.
+    Seuls les blocs de données comptent dans la borne : open/close/stop
+    passent toujours, sans attente, dans l'ordre des blocs.
+    """
+
+    def __init__(self, sink, max_blocks=64):
+        self.sink = sink
+        self.dropped = 0
+        self._max_blocks = max_blocks
+        self._items = deque()
+        self._data = 0  # Blocs de données en attente
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, name=f"sink-{sink}", daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._items:
+                    self._cond.wait()
+                kind, payload = self._items.popleft()
+                if kind == "data":
+                    self._data -= 1
+            try:
+                if kind == "open":
+                    self.sink.open(payload)
+                elif kind == "data":
+                    self.sink.write(payload)
+                else:
+                    self.sink.close()
+                    if kind == "stop":
+                        return
+            except Exception as e:
+                logger.error(f"Sortie {self.sink} : {e}")
+
+    def _put(self, kind, payload=None):
+        """Appelé depuis le thread audio : ne bloque jamais."""
+        with self._cond:
+            if kind == "data":
+                if self._data >= self._max_blocks:
+                    self.dropped += 1
+                    return
+                self._data += 1
+            self._items.append((kind, payload))
+            self._cond.notify()
+
+    def open(self, fmt):
+        self._put("open", fmt)
+
+    def write(self, data):
+        # Copie : le bloc reçu est une vue prêtée par le tampon circulaire
+        self._put("data", bytes(data))
+        return 0
+
+    def close(self):
+        self._put("close")
+
+    def stop(self):
+        self._put("stop")
+        self._thread.join(timeout=2)
+
+    def __str__(self):
+        return str(self.sink)
+
+
+def make_sink(spec, periodsize=1024, native=False):
+    """
+    'alsa:hw:1,0' / 'file:/chemin.raw' / 'fifo:/tmp/snapfifo' / 'wav:/chemin.wav' / 'null'
+    (sans préfixe : device ALSA).
+    """
+    kind, _, target = spec.partition(":")
+    if spec == "null":
+        return NullSink()
+    if kind == "wav":
+        return WavFileSink(target)
+    if kind in ("file", "fifo"):
+        return FileSink(target)
+    if kind == "alsa":
+        return AlsaSink(target or "default", periodsize, native)
+    return AlsaSink(spec, periodsize, native)
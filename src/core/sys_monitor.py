@@ -1,11 +1,11 @@
 # src/core/sys_monitor.py
-import psutil
 import platform
 import os
 import shutil
 
 def get_system_stats():
     """Récupère les stats style 'Cockpit'"""
+    import psutil  # Chargé au premier appel : inutile au démarrage du serveur
     
     # 1. CPU & RAM
     cpu_usage = psutil.cpu_percent(interval=None)
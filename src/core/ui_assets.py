@@ -0,0 +1,157 @@
+# src/core/ui_assets.py
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+
+logger = logging.getLogger("UiAssets")
+
+# --- ASSETS DE L'INTERFACE ---
+# Build (python -m src.core.ui_assets) : ui/ -> build/ui/
+#   assets/js/app.js -> assets/js/app.3f2a9c1b7e.js (+ .gz, + .br si le module brotli est là)
+#   index.html réécrit pour pointer sur les noms empreintés.
+# Service : index des fichiers construit une fois au démarrage (plus de
+# os.path.exists par requête), variante précompressée choisie selon
+# Accept-Encoding, cache "immutable" d'un an pour les noms empreintés.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SOURCE_DIR = os.path.join(REPO_ROOT, "ui")
+BUILD_DIR = os.path.join(REPO_ROOT, "build", "ui")
+MANIFEST = "manifest.json"
+COMPRESSIBLE = (".html", ".css", ".js", ".json", ".svg", ".txt")
+MIN_COMPRESS_BYTES = 512
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))  # Ordre de préférence
+IMMUTABLE = "public, max-age=31536000, immutable"
+FINGERPRINT = re.compile(r"\.[0-9a-f]{10}\.[^./]+$")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# --- Build ---
+def _fingerprint(rel, data):
+    base, ext = os.path.splitext(rel)
+    return f"{base}.{hashlib.sha1(data).hexdigest()[:10]}{ext}"
+
+
+def _rewrite(text, mapping):
+    # Les plus longs d'abord : "assets/js/app.js" avant un éventuel "app.js"
+    for src in sorted(mapping, key=len, reverse=True):
+        text = text.replace(src, mapping[src])
+    return text
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    if path.endswith(COMPRESSIBLE) and len(data) >= MIN_COMPRESS_BYTES:
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(data, quality=11))
+
+
+def build(source=SOURCE_DIR, dest=BUILD_DIR):
+    """Construit dest à partir de source. Renvoie le manifeste {chemin source: chemin empreinté}."""
+    files = []
+    for root, _, names in os.walk(source):
+        for name in names:
+            files.append(os.path.relpath(os.path.join(root, name), source).replace(os.sep, "/"))
+    assets = sorted(f for f in files if f.startswith("assets/"))
+    pages = sorted(f for f in files if not f.startswith("assets/"))
+
+    # Images et polices d'abord, puis CSS/JS (qui peuvent les référencer) : les
+    # empreintes en cascade restent justes.
+    assets.sort(key=lambda f: f.endswith((".css", ".js")))
+    manifest = {}
+    if os.path.isdir(dest):
+        shutil.rmtree(dest)
+    for rel in assets:
+        with open(os.path.join(source, rel), "rb") as f:
+            data = f.read()
+        if rel.endswith((".css", ".js")):
+            data = _rewrite(data.decode("utf-8"), manifest).encode("utf-8")
+        manifest[rel] = _fingerprint(rel, data)
+        _write(os.path.join(dest, manifest[rel]), data)
+    for rel in pages:
+        with open(os.path.join(source, rel), "rb") as f:
+            data = f.read()
+        if rel.endswith(".html"):
+            data = _rewrite(data.decode("utf-8"), manifest).encode("utf-8")
+        _write(os.path.join(dest, rel), data)
+
+    with open(os.path.join(dest, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    if brotli is None:
+        logger.warning("Module brotli absent : variantes .gz seulement")
+    return manifest
+
+
+# --- Service ---
+class AssetIndex:
+    """Fichiers servis, indexés une fois : chemin -> (fichier, type MIME, variantes compressées)."""
+
+    def __init__(self, folder, live=False):
+        self.folder = folder
+        self.live = live  # Sources (dev) : un fichier ajouté depuis le démarrage est pris au vol
+        self.files = {}
+        for root, _, names in os.walk(folder):
+            for name in names:
+                if not name.endswith((".gz", ".br")) and name != MANIFEST:
+                    self._add(os.path.relpath(os.path.join(root, name), folder).replace(os.sep, "/"))
+
+    def _add(self, rel):
+        full = os.path.join(self.folder, rel)
+        variants = [(enc, full + suffix) for enc, suffix in ENCODINGS if os.path.exists(full + suffix)]
+        mimetype = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        self.files[rel] = (full, mimetype, variants)
+
+    @classmethod
+    def default(cls):
+        """build/ui s'il a été construit, sinon ui/ tel quel (développement)."""
+        if os.path.exists(os.path.join(BUILD_DIR, MANIFEST)):
+            return cls(BUILD_DIR)
+        return cls(SOURCE_DIR, live=True)
+
+    def __contains__(self, path):
+        if path in self.files:
+            return True
+        full = os.path.normpath(os.path.join(self.folder, path))
+        if self.live and full.startswith(self.folder + os.sep) and os.path.isfile(full):
+            self._add(path)
+            return True
+        return False
+
+    def send(self, path, accept_encoding=""):
+        from flask import send_file
+
+        full, mimetype, variants = self.files[path]
+        accepted = {e.split(";")[0].strip() for e in accept_encoding.split(",")}
+        encoding = next((enc for enc, _ in variants if enc in accepted), None)
+        if encoding:
+            full = dict(variants)[encoding]
+        immutable = bool(FINGERPRINT.search(path))
+        resp = send_file(full, mimetype=mimetype, conditional=True)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        if variants:
+            resp.vary.add("Accept-Encoding")
+        # Noms empreintés : le contenu ne change jamais, aucune revalidation.
+        # Le reste (index.html) : revalidation à chaque fois (ETag -> 304).
+        resp.headers["Cache-Control"] = IMMUTABLE if immutable else "no-cache"
+        return resp
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    result = build()
+    for src, dst in sorted(result.items()):
+        print(f"  {src} -> {dst}")
+    print(f"✅ UI construite dans {BUILD_DIR}")
@@ -0,0 +1,111 @@
+# src/core/waveform.py
+import hashlib
+import logging
+import os
+import struct
+import time
+
+from src.core.db import DATA_DIR, get_db
+from src.core.decoding import iter_pcm
+from src.core.jobs import run_batch
+from src.core import metadata
+
+logger = logging.getLogger("Waveform")
+
+# --- CACHE DES FORMES D'ONDE ---
+# Un fichier binaire par piste : en-tête + paires (min, max) en int8.
+# 1000 colonnes = 2 Ko par piste, servis tels quels à l'UI.
+WAVEFORM_DIR = os.path.join(DATA_DIR, "cache", "waveforms")
+WAVEFORM_BINS = 1000
+WAVEFORM_RATE = 8000  # Hz, mono : largement suffisant pour un affichage
+FINE_BLOCK = 64       # Échantillons par min/max intermédiaire
+
+HEADER = struct.Struct("<4sdI")  # magic, mtime du fichier audio, nombre de colonnes
+MAGIC = b"TWF1"
+
+
+def music_file(path):
+    """Chemin absolu d'une piste (MPD donne des chemins relatifs à la bibliothèque)."""
+    return path if os.path.isabs(path) else os.path.join(metadata.MUSIC_PATH, path)
+
+
+def cache_file(path):
+    return os.path.join(WAVEFORM_DIR, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".bin")
+
+
+def compute_peaks(filename, bins=WAVEFORM_BINS):
+    """Décode une seule fois (en flux) et renvoie les pics (min, max) sous forme de bytes int8."""
+    import numpy as np
+
+    fine_min, fine_max = [], []
+    block_bytes = FINE_BLOCK * 4 * 1024  # float32 mono
+    for data in iter_pcm(filename, block_bytes=block_bytes, sample_fmt="f32le",
+                         channels=1, rate=WAVEFORM_RATE):
+        x = np.frombuffer(data, dtype=np.float32, count=len(data) // 4)
+        n = len(x) - len(x) % FINE_BLOCK
+        if n:
+            blocks = x[:n].reshape(-1, FINE_BLOCK)
+            fine_min.append(blocks.min(axis=1))
+            fine_max.append(blocks.max(axis=1))
+        if n < len(x):  # Reste du dernier bloc
+            fine_min.append(x[n:].min(keepdims=True))
+            fine_max.append(x[n:].max(keepdims=True))
+
+    if not fine_min:
+        return b""
+
+    mins = np.concatenate(fine_min)
+    maxs = np.concatenate(fine_max)
+    if len(mins) > bins:
+        starts = np.linspace(0, len(mins), bins + 1).astype(np.int64)[:-1]
+        mins = np.minimum.reduceat(mins, starts)
+        maxs = np.maximum.reduceat(maxs, starts)
+
+    pairs = np.column_stack((mins, maxs)) * 127.0
+    return np.clip(np.round(pairs), -127, 127).astype(np.int8).tobytes()
+
+
+def read_cached(path):
+    """Renvoie les pics en cache s'ils correspondent encore au fichier (mtime), sinon None."""
+    try:
+        mtime = os.path.getmtime(music_file(path))
+        with open(cache_file(path), "rb") as f:
+            magic, cached_mtime, _bins = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or cached_mtime != mtime:
+                return None
+            return f.read()
+    except (OSError, struct.error):
+        return None
+
+
+def store_peaks(path):
+    """Tâche du pool : calcule et écrit le cache d'une piste. Renvoie le nombre de colonnes."""
+    filename = music_file(path)
+    mtime = os.path.getmtime(filename)
+    peaks = compute_peaks(filename)
+    bins = len(peaks) // 2
+
+    os.makedirs(WAVEFORM_DIR, exist_ok=True)
+    target = cache_file(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, mtime, bins))
+        f.write(peaks)
+    os.replace(tmp, target)
+    return bins
+
+
+def build_waveforms(paths=None, workers=None):
+    """Précalcule les formes d'onde manquantes ou périmées (toute la bibliothèque par défaut)."""
+    start_t = time.time()
+    if paths is None:
+        conn = get_db()
+        paths = [r["path"] for r in conn.execute("SELECT path FROM tracks")]
+        conn.close()
+
+    todo = [p for p in paths if read_cached(p) is None]
+    logger.info(f"Formes d'onde : {len(todo)} à calculer sur {len(paths)}")
+    result = run_batch(store_peaks, todo, workers=workers)
+    result.update(ok=True, skipped=len(paths) - len(todo), time=round(time.time() - start_t, 2))
+    logger.info(f"✅ Formes d'onde terminées : {result}")
+    return result
@@ -193,10 +193,21 @@
         renderList(d, false, renderTrackRow);
     };
 
+    // Une page de la grille = un JSON + une seule image (mosaïque de pochettes)
+    function spriteTile(sp, off) {
+        if(!sp || !off) return `<img class="grid-img" src="assets/img/no_cover.png">`;
+        const cols = sp.columns, rows = Math.round(sp.height / sp.tile);
+        const col = off.x / sp.tile, row = off.y / sp.tile;
+        const px = cols > 1 ? col / (cols - 1) * 100 : 0, py = rows > 1 ? row / (rows - 1) * 100 : 0;
+        return `<div class="grid-img sprite-tile" style="background-image:url('${sp.url}'); background-size:${cols*100}% ${rows*100}%; background-position:${px}% ${py}%"></div>`;
+    }
+
     window.loadGlobalAlbums = async (append=false) => {
         if(!append) { navHistory=[]; setupView('albums'); }
-        const d = await apiFetch(`/api/content/browse/albums_global?page=${currentPage}&limit=50`);
-        renderGrid(d, append, i => `<div class="grid-item" onclick="openAlbum('${esc(i.album)}')"><img class="grid-img" src="/api/content/cover?path=${encodeURIComponent(i.path)}&album=${encodeURIComponent(i.album)}" onerror="this.src='assets/img/no_cover.png'"><div><b>${i.album}</b></div><small>${i.artist}</small></div>`);
+        const d = await apiFetch(`/api/content/browse/albums_global/sprite?page=${currentPage}&limit=50`);
+        const sp = d?.sprite;
+        let idx = 0;
+        renderGrid(d, append, i => `<div class="grid-item" onclick="openAlbum('${esc(i.album)}')">${spriteTile(sp, sp?.offsets[idx++])}<div><b>${i.album}</b></div><small>${i.artist}</small></div>`);
     };
     
     window.loadGenres = async () => { navHistory=[]; setupView('genres'); const d=await apiFetch("/api/content/browse/genres"); renderList(d,false,i=>`<div class="rowitem" onclick="openGenre('${esc(i.genre)}')"><div class="grow"><b>${i.genre}</b></div><div class="tag">${i.count}</div></div>`); };
@@ -281,7 +292,35 @@
     // SECTION 6: LECTEUR & STATUS
     // =========================================
     function startTimer() { if(timerInterval) clearInterval(timerInterval); timerInterval = setInterval(()=> { if(isPlaying && currentElapsed < currentDuration && !window.isDragging) { currentElapsed++; updateTimeUI(); } }, 1000); }
-    function updateTimeUI() { $("time_elapsed").innerText = formatTime(currentElapsed); $("time_total").innerText = formatTime(currentDuration); $("seek_bar").max = currentDuration; $("seek_bar").value = currentElapsed; }
+    function updateTimeUI() { $("time_elapsed").innerText = formatTime(currentElapsed); $("time_total").innerText = formatTime(currentDuration); $("seek_bar").max = currentDuration; $("seek_bar").value = currentElapsed; drawWaveform(); }
+
+    // --- FORME D'ONDE (pics précalculés côté serveur, paires min/max int8) ---
+    let waveformPeaks = null;
+    async function loadWaveform(file) {
+        waveformPeaks = null;
+        const key = $("apiKey")?.value || localStorage.getItem(KEY_LS) || "secret";
+        try {
+            const r = await fetch(`/api/content/waveform?path=${encodeURIComponent(file)}`, { headers: { "X-API-Key": key } });
+            if(r.ok) waveformPeaks = new Int8Array(await r.arrayBuffer());
+        } catch(e) {}
+        drawWaveform();
+    }
+    function drawWaveform() {
+        const cv = $("waveform"); if(!cv) return;
+        const w = cv.clientWidth, h = cv.clientHeight;
+        if(cv.width !== w) cv.width = w;
+        if(cv.height !== h) cv.height = h;
+        const ctx = cv.getContext("2d"); ctx.clearRect(0, 0, w, h);
+        if(!waveformPeaks || !waveformPeaks.length) return;
+        const bins = waveformPeaks.length / 2, mid = h / 2;
+        const played = currentDuration ? currentElapsed / currentDuration : 0;
+        for(let x = 0; x < w; x++) {
+            const i = Math.floor(x / w * bins) * 2;
+            const lo = waveformPeaks[i] / 127 * mid, hi = waveformPeaks[i + 1] / 127 * mid;
+            ctx.fillStyle = (x / w) < played ? "#0069d9" : "#555";
+            ctx.fillRect(x, mid - hi, 1, Math.max(1, hi - lo));
+        }
+    }
     
     window.seekTrack = async (s) => { window.isDragging = false; currentElapsed = parseInt(s); updateTimeUI(); await apiFetch("/api/player/seek", "POST", {seconds: currentElapsed}); refreshStatus(); };
     window.toggleShuffle = async () => { await apiFetch("/api/player/shuffle", "POST"); refreshStatus(); };
@@ -309,7 +348,7 @@
                 if(!window.isDragging) { currentElapsed = parseInt(p[0]); currentDuration = parseInt(p[1]); updateTimeUI(); } 
             } else if(s.state === "stop") { currentElapsed=0; currentDuration=0; updateTimeUI(); } 
             
-            if(c.file && $("np_cover").dataset.last !== c.file) { $("np_cover").src=`/api/content/cover?path=${encodeURIComponent(c.file)}&t=${Date.now()}`; $("np_cover").dataset.last=c.file; } 
+            if(c.file && $("np_cover").dataset.last !== c.file) { $("np_cover").src=`/api/content/cover?path=${encodeURIComponent(c.file)}&t=${Date.now()}`; $("np_cover").dataset.last=c.file; loadWaveform(c.file); } 
         } 
     }
 